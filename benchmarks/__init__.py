@@ -0,0 +1,2 @@
+"""Benchmarks of changelog_handler against synthetic change logs. Run them with python -m benchmarks, which writes
+the timings as JSON so they can be compared between commits with --compare."""
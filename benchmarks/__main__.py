@@ -0,0 +1,151 @@
+import argparse
+import json
+import pathlib
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+from changelog_handler import Changelog, SemanticVersion, __version__
+
+from .generate import writeChangelog
+
+
+def createParser() -> argparse.ArgumentParser:
+    """Create the ArgumentParser object for the benchmarks."""
+
+    parser = argparse.ArgumentParser(description='Time changelog_handler against a synthetic change log and record '
+                                     'the results as JSON.', prog='benchmarks')
+    parser.add_argument('--versions', help='number of versions in the change log', type=int, default=500)
+    parser.add_argument('--entries', help='number of entries under each change tag', type=int, default=3)
+    parser.add_argument('--pre-release-density', help='fraction of versions that are pre-releases', type=float,
+                        default=0.1)
+    parser.add_argument('--links', help='number of versions in the link table; defaults to all of them', type=int,
+                        default=None)
+    parser.add_argument('--seed', help='seed of the change log generator', type=int, default=0)
+    parser.add_argument('-r', '--repeat', help='number of times each benchmark is repeated, the best is kept',
+                        type=int, default=5)
+    parser.add_argument('-k', '--only', help='only run the benchmarks whose names contain one of these strings',
+                        nargs='+', default=None)
+    parser.add_argument('-o', '--output', help='path to write the JSON results to; they are written to stdout '
+                        'otherwise', type=pathlib.Path, default=None)
+    parser.add_argument('--compare', help='previous JSON results to compare against', type=pathlib.Path,
+                        default=None)
+
+    return parser
+
+
+def getBenchmarks(path: pathlib.Path, text: str) -> dict:
+    """Return the benchmarks to run against the change log at path as a dict of name to a function with no
+    arguments."""
+
+    log = Changelog(path)
+    versions = log.versions
+    middle = versions[len(versions) // 2]
+    middleString = str(middle)
+    missing = SemanticVersion('999.0.0')
+    strings = [str(v) for v in versions]
+    reversedVersions = versions[::-1]
+    command = [sys.executable, '-m', 'changelog_handler', '-p', str(path)]
+
+    return {
+        'load': lambda: Changelog(path),
+        'load.lazy': lambda: Changelog(path, lazy=True),
+        'load.memoryMap': lambda: Changelog(path, lazy=True, memoryMap=True),
+        'getitem': lambda: log[middle],
+        'getitem.str': lambda: log[middleString],
+        'contains': lambda: middle in log,
+        'contains.missing': lambda: missing in log,
+        'toDict': log.toDict,
+        'version.parse': lambda: (SemanticVersion.clearCache(), [SemanticVersion(s) for s in strings]),
+        'version.parse.cached': lambda: [SemanticVersion(s) for s in strings],
+        'version.parseMany': lambda: SemanticVersion.parseMany(strings),
+        'version.findAll': lambda: SemanticVersion.findAll(text),
+        'version.sort': lambda: sorted(reversedVersions),
+        'cli.latest': lambda: subprocess.run(command + [str(versions[1])], check=True, stdout=subprocess.DEVNULL),
+        'cli.all': lambda: subprocess.run(command + ['--all'], check=True, stdout=subprocess.DEVNULL),
+    }
+
+
+def timeBenchmark(function, repeat: int) -> dict:
+    """Time a function, calling it enough times per repeat for the total to take at least 0.2 seconds."""
+
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    times = timer.repeat(repeat, number)
+
+    return {'best': min(times) / number, 'mean': sum(times) / len(times) / number, 'number': number,
+            'repeat': repeat}
+
+
+def getCommit() -> str:
+    """Return the git commit the benchmarks are run from, or an empty string if it can't be found."""
+
+    try:
+        result = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                cwd=pathlib.Path(__file__).parent)
+    except OSError:
+        return ''
+
+    return result.stdout.strip() if result.returncode == 0 else ''
+
+
+def compareResults(previous: dict, current: dict):
+    """Print the change of each benchmark's best time against previous results."""
+
+    print(f'{"benchmark":<20}{"previous":>14}{"current":>14}{"ratio":>9}', file=sys.stderr)
+    for name, result in current['results'].items():
+        before = previous.get('results', {}).get(name)
+        if before is None:
+            continue
+        ratio = result['best'] / before['best']
+        print(f'{name:<20}{before["best"] * 1e6:>12.1f}us{result["best"] * 1e6:>12.1f}us{ratio:>8.2f}x',
+              file=sys.stderr)
+    if previous.get('parameters') != current['parameters']:
+        print('warning: the results were generated with different parameters', file=sys.stderr)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = createParser().parse_args(argv)
+    parameters = {'versions': args.versions, 'entriesPerTag': args.entries,
+                  'preReleaseDensity': args.pre_release_density, 'linkTableSize': args.links, 'seed': args.seed}
+
+    with tempfile.TemporaryDirectory() as tempDir:
+        path = pathlib.Path(tempDir) / 'CHANGELOG.md'
+        text = writeChangelog(path, **parameters)
+        size = path.stat().st_size
+
+        results = {}
+        for name, function in getBenchmarks(path, text).items():
+            if args.only and not any(s in name for s in args.only):
+                continue
+            results[name] = timeBenchmark(function, args.repeat)
+            print(f'{name:<20}{results[name]["best"] * 1e6:>12.1f}us', file=sys.stderr)
+
+    output = {
+        'commit': getCommit(),
+        'version': __version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'parameters': dict(parameters, size=size),
+        'results': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(output, f, indent=2)
+    else:
+        print(json.dumps(output, indent=2))
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            compareResults(json.load(f), output)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
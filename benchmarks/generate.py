@@ -0,0 +1,81 @@
+import datetime
+import os
+import random
+
+__all__ = ['generateChangelog', 'writeChangelog']
+
+TAGS = ['Added', 'Changed', 'Deprecated', 'Removed', 'Fixed', 'Security']
+PRE_RELEASE_LABELS = ['alpha', 'beta', 'rc']
+WORDS = ['parser', 'version', 'link', 'heading', 'cache', 'section', 'release', 'output', 'option', 'error',
+         'support', 'handling', 'performance', 'memory', 'format']
+
+
+def _versions(count: int, preReleaseDensity: float, rng: random.Random) -> list[str]:
+    """Return count increasing versions, where roughly preReleaseDensity of them are pre-releases of the release
+    that follows them."""
+
+    versions = []
+    major, minor, patch = 0, 1, 0
+    preRelease = label = 0
+    while len(versions) < count:
+        if rng.random() < preReleaseDensity:
+            # Labels only move forward so the pre-releases stay in order of precedence.
+            preRelease += 1
+            label = rng.randint(label, len(PRE_RELEASE_LABELS) - 1)
+            versions.append(f'{major}.{minor}.{patch}-{PRE_RELEASE_LABELS[label]}.{preRelease}')
+            continue
+
+        versions.append(f'{major}.{minor}.{patch}')
+        preRelease = label = 0
+        bump = rng.random()
+        if bump < 0.05:
+            major, minor, patch = major + 1, 0, 0
+        elif bump < 0.3:
+            minor, patch = minor + 1, 0
+        else:
+            patch += 1
+
+    return versions
+
+
+def generateChangelog(versions: int = 100, entriesPerTag: int = 3, preReleaseDensity: float = 0.1,
+                      linkTableSize: int | None = None, seed: int = 0) -> str:
+    """Generate a Keep a Changelog formatted change log with an Unreleased section and the given number of versions,
+    newest first. Each version has between one and four change tags with entriesPerTag entries each, and
+    linkTableSize versions (all of them by default) have a link definition at the end of the file. The same
+    parameters and seed always generate the same text."""
+
+    if not 0 <= preReleaseDensity < 1:
+        raise ValueError('preReleaseDensity must be at least 0 and less than 1')
+
+    rng = random.Random(seed)
+    released = _versions(versions, preReleaseDensity, rng)
+    date = datetime.date(2000, 1, 1)
+    sections = []
+    for version in released:
+        date += datetime.timedelta(days=rng.randint(1, 30))
+        lines = [f'## [{version}] - {date.isoformat()}', '']
+        for tag in sorted(rng.sample(TAGS, rng.randint(1, 4)), key=TAGS.index):
+            lines += [f'### {tag}', '']
+            lines += [f'- {" ".join(rng.choices(WORDS, k=rng.randint(4, 12))).capitalize()}.'
+                      for _ in range(entriesPerTag)]
+            lines.append('')
+        sections.append('\n'.join(lines))
+
+    header = ('# Changelog\n\nAll notable changes to this project will be documented in this file.\n\n'
+              '## [Unreleased]\n\n### Added\n\n- Work in progress.\n')
+    linkCount = len(released) if linkTableSize is None else min(linkTableSize, len(released))
+    links = ['[Unreleased]: https://example.com/compare/HEAD']
+    links += [f'[{v}]: https://example.com/releases/{v}' for v in reversed(released[-linkCount:])] if linkCount else []
+
+    return '\n'.join([header] + sections[::-1] + links) + '\n'
+
+
+def writeChangelog(path: str | os.PathLike, **parameters) -> str:
+    """Generate a change log with generateChangelog and write it to path. Returns the generated text."""
+
+    text = generateChangelog(**parameters)
+    with open(path, 'w') as f:
+        f.write(text)
+
+    return text
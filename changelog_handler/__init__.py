@@ -1,6 +1,5 @@
-import importlib.metadata
+from importlib import import_module
 
-__version__ = importlib.metadata.version(__package__)
 __all__ = []
 
 from .version import *
@@ -8,3 +7,36 @@ __all__ += version.__all__
 
 from .changelog import *
 __all__ += changelog.__all__
+
+# The names of modules only some users need, which are imported the first time one of their names is used.
+_LAZY = {
+    'cache': ['ParseCache', 'DEFAULT_CACHE_PATH'],
+    'constraint': ['VersionConstraint', 'InvalidConstraint'],
+    'table': ['VersionTable'],
+    'scanner': ['ChangelogSummary', 'summarize', 'scan'],
+    'server': ['ChangelogServer', 'ChangelogClient', 'ServerError', 'DEFAULT_SOCKET_PATH'],
+    'profiling': ['Profile', 'PhaseStats', 'PHASES'],
+    'search': ['SearchIndex', 'SearchHit', 'tokenize'],
+}
+_MODULES = {name: module for module, names in _LAZY.items() for name in names}
+__all__ += _MODULES
+
+
+def __getattr__(name: str):
+    module = _MODULES.get(name)
+    if module is not None:
+        value = globals()[name] = getattr(import_module(f'.{module}', __name__), name)
+        return value
+
+    # Reading the installed distribution's metadata is slow, so the version is only looked up when it's used.
+    if name == '__version__':
+        import importlib.metadata
+
+        version = globals()['__version__'] = importlib.metadata.version(__package__)
+        return version
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_MODULES))
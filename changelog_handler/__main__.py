@@ -1,9 +1,15 @@
 import argparse
+import contextlib
+import os
 import pathlib
-import platform
 import sys
 
-from . import __version__, SemanticVersion, Changelog, Changes
+from . import SemanticVersion, InvalidSemanticVersion, Changelog, Changes, extractChanges
+from ._defaults import DEFAULT_CACHE_PATH, DEFAULT_SOCKET_PATH
+from .changelog import _writeJSONItems
+
+# Printing the changes of a version only needs the parser, so the modules of the subcommands, the server client,
+# the cache, search and profiling are imported where they're used to keep the command quick to start.
 
 
 class CheckUniqueTags(argparse.Action):
@@ -21,16 +27,43 @@ class CheckUniqueTags(argparse.Action):
         setattr(namespace, self.dest, values)
 
 
+class LazyVersion(argparse.Action):
+    """Prints the version of the package and exits. The version is only looked up when the option is used, as
+    reading the distribution metadata is slow."""
+
+    def __init__(self, option_strings, dest=argparse.SUPPRESS, default=argparse.SUPPRESS, help=None):
+        super().__init__(option_strings=option_strings, dest=dest, default=default, nargs=0,
+                         help="show program's version number and exit" if help is None else help)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        from . import __version__
+
+        print(f'{parser.prog} {__version__}')
+        parser.exit()
+
+
 def correctOption(string):
     """Handle the input string based on OS type."""
 
-    if platform.system() == 'Windows':
+    if sys.platform == 'win32':
         # Windows escaped newline character needs to be replaced.
         return string.replace('\\n', '\n')
 
     return string
 
 
+def versionArgument(string):
+    """Parse a version, or a range of versions in the form low..high where either end may be omitted."""
+
+    try:
+        if '..' in string:
+            low, high = string.split('..', 1)
+            return SemanticVersion(low) if low else None, SemanticVersion(high) if high else None
+        return SemanticVersion(string)
+    except InvalidSemanticVersion:
+        raise argparse.ArgumentTypeError(f'invalid version or range: {string!r}')
+
+
 DEFAULT_TAG_ORDER = ['added', 'changed', 'deprecated', 'removed', 'fixed', 'security']
 
 
@@ -38,15 +71,57 @@ def createParser() -> argparse.ArgumentParser:
     """Create the ArgumentParser object for this script."""
 
     parser = argparse.ArgumentParser(description='Parse a change log for specific version changes.', prog=__package__)
-    parser.add_argument('version', help='the version to parse the changelog for', type=SemanticVersion)
-    parser.add_argument('-v', '--version', action='version', version=f'%(prog)s {__version__}')
-    parser.add_argument('-o', '--output-path', help='path to output changes to', type=pathlib.Path, default=None)
+    parser.add_argument('version', help='the versions to parse the changelog for, either a single version or an '
+                        'inclusive range such as 2.0.0..2.4.1', nargs='*', type=versionArgument)
+    parser.add_argument('-a', '--all', help='output the changes for every version in the change log',
+                        action='store_true')
+    parser.add_argument('-v', '--version', action=LazyVersion)
+    parser.add_argument('-o', '--output-path', help='path to output changes to; {version} is replaced with each '
+                        'version to write them to separate files', type=pathlib.Path, default=None)
+    parser.add_argument('--separator', help='text written between versions when outputting several to the same '
+                        'place', type=correctOption, default='\n\n')
     parser.add_argument('-t', '--tag-order', help='order that change tags will appear', nargs='+',
                         choices=DEFAULT_TAG_ORDER, action=CheckUniqueTags, type=str.lower)
-    parser.add_argument('--prepend', help='optional heading to prepend before outputting changes',
-                        type=correctOption)
+    parser.add_argument('--prepend', help='optional heading to prepend before outputting changes; {version} is '
+                        'replaced with the version', type=correctOption)
     parser.add_argument('--add-link', help='append the link to the version found in the change log',
                         action='store_true')
+    parser.add_argument('--format', help='output the changes as text, or as a JSON object of each version\'s '
+                        'version, link and changes; --tag-order, --prepend, --separator and --add-link only apply '
+                        'to text', choices=['text', 'json'], default='text')
+
+    addCacheArguments(parser)
+    socketGroup = parser.add_mutually_exclusive_group()
+    socketGroup.add_argument('--socket', help='query the server started by the serve subcommand on this socket, and '
+                             'only parse the change log here if it cannot answer; defaults to the '
+                             'CHANGELOG_HANDLER_SOCKET environment variable if set', type=pathlib.Path, default=None)
+    socketGroup.add_argument('--default-socket', help=f'query the server on the socket {DEFAULT_SOCKET_PATH} in the '
+                             'current directory', action='store_const', dest='socket',
+                             const=pathlib.Path(DEFAULT_SOCKET_PATH))
+    parser.add_argument('--profile', help='print the time, calls and bytes of each phase of parsing the change log '
+                        'to stderr', action='store_true')
+
+    addChangelogArguments(parser)
+
+    return parser
+
+
+def addCacheArguments(parser: argparse.ArgumentParser):
+    """Add the mutually exclusive --cache, --default-cache and --no-cache options."""
+
+    # --cache takes a value rather than defaulting to DEFAULT_CACHE_PATH when it's left out, which would make it
+    # consume a version following it.
+    cacheGroup = parser.add_mutually_exclusive_group()
+    cacheGroup.add_argument('--cache', help='path to a cache file for the parsed change log index; defaults to the '
+                            'CHANGELOG_HANDLER_CACHE environment variable if set', type=pathlib.Path, default=None)
+    cacheGroup.add_argument('--default-cache', help=f'use the cache file {DEFAULT_CACHE_PATH} in the current '
+                            'directory', action='store_const', dest='cache', const=pathlib.Path(DEFAULT_CACHE_PATH))
+    cacheGroup.add_argument('--no-cache', help='do not use a cache file even if CHANGELOG_HANDLER_CACHE is set',
+                            action='store_true')
+
+
+def addChangelogArguments(parser: argparse.ArgumentParser):
+    """Add the mutually exclusive options locating the change log."""
 
     changeGroup = parser.add_mutually_exclusive_group()
     changeGroup.add_argument('-d', '--changelog-dir', help='path to the directory to search for CHANGELOG.md',
@@ -54,8 +129,6 @@ def createParser() -> argparse.ArgumentParser:
     changeGroup.add_argument('-p', '--changelog-path', type=pathlib.Path,
                              help='path to the change log; use this to specify an alternate filename')
 
-    return parser
-
 
 def getChangelogPath(args: argparse.Namespace) -> pathlib.Path:
     """Determine path to the change log based on optional arguments."""
@@ -72,6 +145,30 @@ def getChangelogPath(args: argparse.Namespace) -> pathlib.Path:
     return changelogPath
 
 
+def getCachePath(args: argparse.Namespace) -> pathlib.Path | None:
+    """Determine the path to the parse cache, or None if caching is disabled."""
+
+    if args.no_cache:
+        return None
+    if args.cache:
+        return args.cache
+    if envPath := os.environ.get('CHANGELOG_HANDLER_CACHE'):
+        return pathlib.Path(envPath)
+
+    return None
+
+
+def getSocketPath(args: argparse.Namespace) -> pathlib.Path | None:
+    """Determine the path to the socket of a running server, or None if no server should be queried."""
+
+    if args.socket:
+        return args.socket
+    if envPath := os.environ.get('CHANGELOG_HANDLER_SOCKET'):
+        return pathlib.Path(envPath)
+
+    return None
+
+
 def getTagOrder(args: argparse.Namespace) -> list[str]:
     """Set the order to output changes."""
 
@@ -97,8 +194,8 @@ def _print(output, file, heading):
     print(output, end='', file=file)
 
 
-def printChanges(changes: Changes, link: str, tagOrder: list[str], file=None, heading=None):
-    """Handle the actual outputting of changes."""
+def formatChanges(changes: Changes, link: str, tagOrder: list[str]) -> str:
+    """Format changes in the tag order, with an optional link appended."""
 
     output = ''
     for tag in tagOrder:
@@ -110,6 +207,14 @@ def printChanges(changes: Changes, link: str, tagOrder: list[str], file=None, he
     if link:
         output += f'\n\n{link}'
 
+    return output
+
+
+def printChanges(changes: Changes, link: str, tagOrder: list[str], file=None, heading=None):
+    """Handle the actual outputting of changes."""
+
+    output = formatChanges(changes, link, tagOrder)
+
     if file:
         with open(file, 'w') as f:
             _print(output, f, heading)
@@ -117,23 +222,290 @@ def printChanges(changes: Changes, link: str, tagOrder: list[str], file=None, he
         _print(output, None, heading)
 
 
-def main():
+def _fill(template, version: SemanticVersion):
+    """Replace {version} in an optional heading or path with the version."""
+
+    if template is None:
+        return None
+    if isinstance(template, pathlib.Path):
+        return pathlib.Path(str(template).replace('{version}', str(version)))
+    return template.replace('{version}', str(version))
+
+
+def getVersions(log: Changelog, args: argparse.Namespace) -> list[SemanticVersion]:
+    """Resolve the version arguments against the change log, in the order they were given."""
+
+    if args.all:
+        return list(dict.fromkeys(log.versions))
+
+    versions = []
+    for item in args.version:
+        if isinstance(item, tuple):
+            versions.extend(log.between(*item))
+        else:
+            versions.append(item)
+
+    return list(dict.fromkeys(versions))
+
+
+def getEntries(changelogPath: pathlib.Path, cachePath: pathlib.Path | None,
+               args: argparse.Namespace) -> list[tuple[SemanticVersion, Changes, str]]:
+    """Read the changes and link of each requested version from the change log."""
+
+    if len(args.version) == 1 and isinstance(args.version[0], SemanticVersion) and not args.all:
+        version = args.version[0]
+        if cachePath:
+            log = Changelog(changelogPath, lazy=True, cache=cachePath)
+            return [(version, log[version], log.links.get(version, ''))]
+
+        # Only read as far into the file as needed, new releases are usually at the top.
+        changes, link = extractChanges(changelogPath, version, link=args.add_link or args.format == 'json')
+        return [(version, changes, link)]
+
+    # Parse the file once for every requested version.
+    log = Changelog(changelogPath, lazy=True, cache=cachePath)
+    return [(version, log[version], log.links.get(version, '')) for version in getVersions(log, args)]
+
+
+def getRemoteEntries(socketPath: pathlib.Path, changelogPath: pathlib.Path,
+                     args: argparse.Namespace) -> list[tuple[SemanticVersion, Changes, str]] | None:
+    """Ask a running server for the changes and link of each requested version. Returns None if there is no server
+    or it can't answer, so the change log can be parsed here instead."""
+
+    from .server import ChangelogClient, ServerError
+
+    try:
+        with ChangelogClient(socketPath) as client:
+            found = {}
+            if args.all:
+                for version, entry in client.request('all', changelogPath).items():
+                    found[SemanticVersion(version)] = entry
+            for item in args.version:
+                if isinstance(item, tuple):
+                    low, high = (None if v is None else str(v) for v in item)
+                    for version, entry in client.request('range', changelogPath, low=low, high=high).items():
+                        found.setdefault(SemanticVersion(version), entry)
+                elif item not in found:
+                    found[item] = client.request('get', changelogPath, version=str(item))
+    except (OSError, ServerError, ValueError):
+        return None
+
+    return [(version, Changes.fromDict(entry['changes']), entry['link']) for version, entry in found.items()]
+
+
+def writeEntries(entries: list[tuple[SemanticVersion, Changes, str]], args: argparse.Namespace,
+                 tagOrder: list[str]):
+    """Output the changes of each version, to separate files if the output path contains {version}."""
+
+    outputPath = args.output_path
+    outputs = []
+    for version, changes, link in entries:
+        link = '[{0}]: {1}'.format(version, link) if args.add_link else ''
+        heading = _fill(args.prepend, version)
+
+        if outputPath and '{version}' in str(outputPath):
+            printChanges(changes, link, tagOrder, file=_fill(outputPath, version), heading=heading)
+        else:
+            outputs.append((heading or '') + formatChanges(changes, link, tagOrder))
+
+    if outputs:
+        output = args.separator.join(outputs)
+        if outputPath:
+            with open(outputPath, 'w') as f:
+                print(output, end='', file=f)
+        else:
+            print(output, end='')
+
+
+def writeJSON(items, args: argparse.Namespace):
+    """Output (version string, getVersion dict) items as a single JSON object, or each to its own JSON file if the
+    output path contains {version}. Items are written as they're produced, so an iterator is never held in memory."""
+
+    outputPath = args.output_path
+    if outputPath and '{version}' in str(outputPath):
+        import json
+
+        for version, data in items:
+            with open(_fill(outputPath, version), 'w') as f:
+                json.dump(data, f)
+        return
+
+    f = open(outputPath, 'w') if outputPath else sys.stdout
+    try:
+        _writeJSONItems(items, f)
+    finally:
+        if outputPath:
+            f.close()
+
+
+def createScanParser() -> argparse.ArgumentParser:
+    """Create the ArgumentParser object for the scan subcommand."""
+
+    parser = argparse.ArgumentParser(description='Parse every change log under a directory in parallel, writing a '
+                                     'JSON summary of each as a line to stdout.', prog=f'{__package__} scan')
+    parser.add_argument('root', help='directory to search for change logs', type=pathlib.Path)
+    parser.add_argument('--pattern', help='glob pattern of change logs relative to root', default='**/CHANGELOG.md')
+    parser.add_argument('-w', '--workers', help='number of worker processes; defaults to the number of CPUs',
+                        type=int, default=None)
+    parser.add_argument('--memory-map', help='read files with mmap, section offsets are then byte offsets',
+                        action='store_true')
+
+    return parser
+
+
+def scanMain(argv: list[str]) -> int:
+    import json
+    from .scanner import scan
+
+    args = createScanParser().parse_args(argv)
+
+    failed = 0
+    for summary in scan(args.root, args.pattern, workers=args.workers, memoryMap=args.memory_map):
+        print(json.dumps(summary._asdict()), flush=True)
+        failed += bool(summary.error)
+
+    return 1 if failed else 0
+
+
+def createServeParser() -> argparse.ArgumentParser:
+    """Create the ArgumentParser object for the serve subcommand."""
+
+    parser = argparse.ArgumentParser(description='Keep parsed change logs in memory and answer queries about them '
+                                     'over a Unix socket until interrupted.', prog=f'{__package__} serve')
+    parser.add_argument('--socket', help='path of the socket to listen on', type=pathlib.Path,
+                        default=pathlib.Path(DEFAULT_SOCKET_PATH))
+    parser.add_argument('--max-logs', help='number of parsed change logs to keep in memory', type=int, default=64)
+
+    return parser
+
+
+def serveMain(argv: list[str]) -> int:
+    from .server import ChangelogServer
+
+    args = createServeParser().parse_args(argv)
+
+    server = ChangelogServer(args.socket, maxLogs=args.max_logs)
+    try:
+        server.listen()
+    except OSError as e:
+        print(f'{__package__} serve: {e}', file=sys.stderr)
+        return 1
+
+    print(f'listening on {server.socketPath}', file=sys.stderr, flush=True)
+    try:
+        server.serveForever()
+    except KeyboardInterrupt:
+        pass
+
+    return 0
+
+
+def createSearchParser() -> argparse.ArgumentParser:
+    """Create the ArgumentParser object for the search subcommand."""
+
+    parser = argparse.ArgumentParser(description='Search the entries of a change log, writing each match as a line '
+                                     'to stdout. Every term must appear in an entry, "quoted phrases" must appear in '
+                                     'order and tag:name only matches entries of that change tag.',
+                                     prog=f'{__package__} search')
+    parser.add_argument('query', help='terms, phrases and tag filters to search for', nargs='+')
+    parser.add_argument('-t', '--tag', help='only match entries of these change tags', nargs='+',
+                        choices=DEFAULT_TAG_ORDER, type=str.lower, default=None)
+    parser.add_argument('-n', '--limit', help='maximum number of matches to output', type=int, default=None)
+    parser.add_argument('--format', help='output matches as tab separated text or as JSON lines',
+                        choices=['text', 'json'], default='text')
+    addCacheArguments(parser)
+    addChangelogArguments(parser)
+
+    return parser
+
+
+def loadSearchIndex(changelogPath: pathlib.Path, cachePath: pathlib.Path | None) -> 'SearchIndex':
+    """Load the search index of the change log from the cache if the file hasn't changed, otherwise build it and
+    store it in the cache."""
+
+    if cachePath is None:
+        return Changelog(changelogPath, lazy=True).searchIndex
+
+    from .cache import ParseCache
+    from .search import SearchIndex
+
+    with open(changelogPath, 'rb') as f:
+        buffer = f.read()
+    cache = ParseCache(cachePath)
+    data = cache.get(changelogPath, 'search', buffer)
+    if data is not None:
+        try:
+            return SearchIndex.fromDict(data)
+        except (ValueError, KeyError, TypeError, InvalidSemanticVersion):
+            pass
+
+    index = Changelog(changelogPath, lazy=True).searchIndex
+    cache.put(changelogPath, 'search', buffer, index.toDict())
+
+    return index
+
+
+def searchMain(argv: list[str]) -> int:
+    import json
+
+    parser = createSearchParser()
+    args = parser.parse_args(argv)
+
+    index = loadSearchIndex(getChangelogPath(args), getCachePath(args))
+    try:
+        hits = index.search(' '.join(args.query), args.tag, args.limit)
+    except ValueError as e:
+        parser.error(str(e))
+
+    for hit in hits:
+        if args.format == 'json':
+            print(json.dumps({'version': str(hit.version), 'tag': hit.tag, 'position': hit.position,
+                              'entry': hit.entry}))
+        else:
+            print(f'{hit.version}\t{hit.tag}\t{" ".join(hit.entry.split())}')
+
+    return 0 if hits else 1
+
+
+SUBCOMMANDS = {'scan': scanMain, 'serve': serveMain, 'search': searchMain}
+
+
+def main(argv: list[str] | None = None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] in SUBCOMMANDS:
+        return SUBCOMMANDS[argv[0]](argv[1:])
+
     parser = createParser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    if not args.version and not args.all:
+        parser.error('a version, a range of versions or --all is required')
 
     changelogPath = getChangelogPath(args)
-    log = Changelog(changelogPath)
-    changes = log[args.version]
+    socketPath = getSocketPath(args)
 
-    tagOrder = getTagOrder(args)
-    outputPath = args.output_path
-    heading = args.prepend
+    profile = None
+    if args.profile:
+        from .profiling import Profile
 
-    if args.add_link:
-        link = '[{0}]: {1}'.format(args.version, log.links.get(args.version, ''))
-    else:
-        link = ''
-    printChanges(changes, link, tagOrder, file=outputPath, heading=heading)
+        profile = Profile()
+
+    with profile if profile is not None else contextlib.nullcontext():
+        if args.format == 'json' and args.all and not socketPath:
+            # Stream every version without keeping their changes.
+            writeJSON(Changelog(changelogPath, lazy=True, cache=getCachePath(args)).iterDicts(), args)
+        else:
+            entries = getRemoteEntries(socketPath, changelogPath, args) if socketPath else None
+            if entries is None:
+                entries = getEntries(changelogPath, getCachePath(args), args)
+            if args.format == 'json':
+                writeJSON(((str(version), Changelog._versionDict(version, changes, link))
+                           for version, changes, link in entries), args)
+            else:
+                writeEntries(entries, args, getTagOrder(args))
+
+    if profile is not None:
+        print(profile.report(), file=sys.stderr)
 
     return 0
 
@@ -0,0 +1,4 @@
+# Default paths of the parse cache and the server's socket. They're kept apart from the cache and server modules so
+# the command line can use them without importing either.
+DEFAULT_CACHE_PATH = '.changelog_handler.cache'
+DEFAULT_SOCKET_PATH = '.changelog_handler.sock'
@@ -9,13 +9,25 @@ VERSION_CORE = rf'(?P<major>\d+)\.(?P<minor>\d+)\.(?P<patch>\d+)'
 SEMVAR_RAW = rf'[Vv]?(?P<version>{VERSION_CORE}(?:-{PRE_RELEASE})?(?:\+{BUILD})?)'
 
 SEMVAR = re.compile(f'{SEMVAR_RAW}$')
+# matches every line of a block of text, as either unreleased, a version or an invalid version
+SEMVAR_LINES = re.compile(rf'^(?:(?P<unreleased>(?i:unreleased))|{SEMVAR_RAW}|(?P<invalid>.*))$', re.MULTILINE)
+# matches versions embedded in other text
+SEMVAR_SEARCH = re.compile(rf'(?<![\w.]){SEMVAR_RAW}(?![\w+-]|\.\w)')
 DATE = r'(?P<date>\d{4}-\d{2}-\d{2})'
 URL = r'\s*\((?P<url>.+)\)'
 # DELIMITER = re.compile(rf'##\s+(\[)?(?:(?P<unreleased>[Uu]nreleased)|{SEMVAR_RAW})(?(1)])(?:{URL})?\s+-\s+{DATE}')
 DELIMITER = re.compile(rf'##\s+(\[)?(?:(?P<unreleased>[Uu]nreleased)|{SEMVAR_RAW})(?(1)])(?:{URL})?(?(3)\s+-\s+{DATE}|)')
 
 LINK = re.compile(rf'\[(?:(?P<unreleased>[Uu]nreleased)|{SEMVAR_RAW})]:\s+(?P<url>.+)')
+# matches entire link lines within a block of text so they can be removed from a section
+LINK_LINE = re.compile(rf'^{LINK.pattern}\n?', re.MULTILINE)
 
 # regex for change tags
 TAGS = 'added|changed|deprecated|removed|fixed|security'
 CHANGE = rf'(?P<tag_literal>###\s+(?P<tag_name>{TAGS}).*?\n)(?P<content>.*?\n*)(?=##+|$)'
+# heading of a single change tag, the content following it runs until the next '##' or the end of the section
+TAG_HEADING = re.compile(rf'###\s+(?P<tag_name>{TAGS}).*?\n', re.IGNORECASE | re.DOTALL)
+# lines that could be a version heading or a link definition, every other line is the content of a section
+CANDIDATE_LINE = re.compile(r'^[#\[].*\n?', re.MULTILINE)
+# a bulleted entry of a change tag, continuing over indented lines and the blank lines between them
+ENTRY = re.compile(r'^[-*+][ \t]+(?P<text>.*(?:\n(?:[ \t]*\n)*[ \t]+\S.*)*)', re.MULTILINE)
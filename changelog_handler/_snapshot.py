@@ -0,0 +1,144 @@
+import mmap
+import struct
+
+MAGIC = b'CLHS'
+# Bump this whenever the layout changes, snapshots of other formats are rejected.
+FORMAT = 1
+TAGS = ('added', 'changed', 'deprecated', 'removed', 'fixed', 'security')
+
+# magic, format, reserved, number of versions, number of links, number of strings
+_HEADER = struct.Struct('<4sHHIII')
+# offset into the string pool and length of a UTF-8 encoded string
+_STRING = struct.Struct('<II')
+# version string, then the tag heading and content strings of each tag, or -1 if the version doesn't have the tag
+_VERSION = struct.Struct(f'<I{2 * len(TAGS)}i')
+# version string and url string
+_LINK = struct.Struct('<II')
+
+
+class _StringPool:
+    """Assigns each distinct string an index, so repeated tag headings are only stored once."""
+
+    __slots__ = '_indexes', '_data', '_size'
+
+    def __init__(self):
+        self._indexes = {}
+        self._data = []
+        self._size = 0
+
+    def add(self, string: str) -> int:
+        index = self._indexes.get(string)
+        if index is None:
+            data = string.encode('utf-8')
+            index = self._indexes[string] = len(self._data)
+            self._data.append(data)
+            self._size += len(data)
+            if self._size > 0xFFFFFFFF:
+                raise ValueError('the string pool of a snapshot is limited to 4 GiB')
+        return index
+
+    def tables(self) -> tuple[bytes, bytes]:
+        """Return the packed string table and the pool of strings it refers to."""
+
+        table = bytearray()
+        offset = 0
+        for data in self._data:
+            table += _STRING.pack(offset, len(data))
+            offset += len(data)
+
+        return bytes(table), b''.join(self._data)
+
+
+def encode(rows: list[tuple[str, dict]], links: list[tuple[str, str]]) -> bytes:
+    """Pack the versions of a change log, in file order with the toDict form of their changes, and its links."""
+
+    pool = _StringPool()
+    versionTable = bytearray()
+    for version, changes in rows:
+        strings = []
+        for tag in TAGS:
+            data = changes.get(tag)
+            if data:
+                strings += [pool.add(data['tag_raw']), pool.add(data['content'])]
+            else:
+                strings += [-1, -1]
+        versionTable += _VERSION.pack(pool.add(version), *strings)
+
+    linkTable = b''.join(_LINK.pack(pool.add(version), pool.add(url)) for version, url in links)
+    stringTable, strings = pool.tables()
+    header = _HEADER.pack(MAGIC, FORMAT, 0, len(rows), len(links), len(stringTable) // _STRING.size)
+
+    return b''.join((header, stringTable, bytes(versionTable), linkTable, strings))
+
+
+class SnapshotReader:
+    """Reads the tables of a snapshot up front and decodes the strings of a version's changes only when they are
+    requested. If memoryMap is True the file is read through mmap instead of into memory."""
+
+    __slots__ = '_buffer', '_strings', '_versionOffset', '_linkOffset', '_poolOffset', '_counts'
+
+    def __init__(self, path: str, memoryMap: bool = False):
+        with open(path, 'rb') as f:
+            if memoryMap:
+                try:
+                    self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:
+                    raise ValueError('the snapshot is empty')
+            else:
+                self._buffer = f.read()
+
+        buffer = self._buffer
+        if len(buffer) < _HEADER.size:
+            self.close()
+            raise ValueError('the snapshot is truncated')
+        magic, fileFormat, _, versions, links, strings = _HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError('not a change log snapshot')
+        if fileFormat != FORMAT:
+            self.close()
+            raise ValueError(f'unsupported snapshot format {fileFormat}, expected {FORMAT}')
+
+        self._strings = _HEADER.size
+        self._versionOffset = self._strings + strings * _STRING.size
+        self._linkOffset = self._versionOffset + versions * _VERSION.size
+        self._poolOffset = self._linkOffset + links * _LINK.size
+        self._counts = versions, links, strings
+        if len(buffer) < self._poolOffset:
+            self.close()
+            raise ValueError('the snapshot is truncated')
+
+    def string(self, index: int) -> str:
+        if not 0 <= index < self._counts[2]:
+            raise ValueError(f'invalid string index {index} in snapshot')
+        offset, length = _STRING.unpack_from(self._buffer, self._strings + index * _STRING.size)
+        start = self._poolOffset + offset
+        if start + length > len(self._buffer):
+            raise ValueError('the snapshot is truncated')
+
+        return str(self._buffer[start:start + length], 'utf-8')
+
+    def versions(self) -> list[str]:
+        """The version strings, in the order of the change log."""
+
+        return [self.string(row[0]) for row in
+                struct.iter_unpack(_VERSION.format, self._buffer[self._versionOffset:self._linkOffset])]
+
+    def links(self) -> list[tuple[str, str]]:
+        return [(self.string(version), self.string(url)) for version, url in
+                struct.iter_unpack(_LINK.format, self._buffer[self._linkOffset:self._poolOffset])]
+
+    def changes(self, row: int) -> dict:
+        """Return the changes of a version's row in the toDict form."""
+
+        indexes = _VERSION.unpack_from(self._buffer, self._versionOffset + row * _VERSION.size)[1:]
+        changes = {}
+        for i, tag in enumerate(TAGS):
+            tagRaw, content = indexes[2 * i:2 * i + 2]
+            changes[tag] = {'tag_raw': self.string(tagRaw), 'content': self.string(content)} if tagRaw >= 0 else {}
+
+        return changes
+
+    def close(self):
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
@@ -0,0 +1,104 @@
+import locale
+import mmap
+import re
+
+from ._pattern import CANDIDATE_LINE
+
+# CANDIDATE_LINE for the undecoded bytes of a file, where lines can also end with '\r\n' or a lone '\r', the same
+# line endings that reading a file in text mode accepts
+_CANDIDATE_BYTES = re.compile(rb'(?:^|(?<=\r))[#\[][^\r\n]*(?:\r\n?|\n)?', re.MULTILINE)
+_LINE_END_BYTES = re.compile(rb'\r\n?|\n')
+
+
+def iterCandidates(contents: str):
+    """Yield the start offset, end offset and text of each line in contents that could be a version heading or a
+    link. The lines in between are skipped by the regex engine rather than visited one at a time."""
+
+    for match in CANDIDATE_LINE.finditer(contents):
+        yield match.start(), match.end(), match[0]
+
+
+def _normalize(text: str) -> str:
+    # Mirror the universal newline handling of files opened in text mode.
+    if '\r' in text:
+        return text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def decode(data: bytes) -> str:
+    """Decode the raw contents of a file the same way as reading it with open() in text mode."""
+
+    return _normalize(data.decode(locale.getpreferredencoding(False)))
+
+
+def encode(text: str, newline: str = '\n') -> bytes:
+    """Encode text the same way as writing it to a file opened in text mode with the given newline."""
+
+    if newline != '\n':
+        text = text.replace('\n', newline)
+    return text.encode(locale.getpreferredencoding(False))
+
+
+def byteOffsets(data: bytes, text: str, offsets) -> list[int]:
+    """Map ascending offsets into text, the result of decode(data), to the offsets of the same places in data. Each
+    offset is found from the start of its line, as the line endings of data may be longer than in text."""
+
+    encoding = locale.getpreferredencoding(False)
+    lineEnds = _LINE_END_BYTES.finditer(data)
+    line = lineStart = 0
+    result = []
+    for offset in offsets:
+        target = text.count('\n', 0, offset)
+        while line < target:
+            lineStart = next(lineEnds).end()
+            line += 1
+        result.append(lineStart + len(text[text.rfind('\n', 0, offset) + 1:offset].encode(encoding)))
+
+    return result
+
+
+class MappedSource:
+    """A read-only, memory mapped view of a file. Offsets are byte offsets into the file, and slices are decoded to
+    str only when they are requested."""
+
+    __slots__ = '_map', '_encoding'
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files can't be mapped.
+                self._map = None
+        # Decode the same way as open() does in text mode.
+        self._encoding = locale.getpreferredencoding(False)
+
+    def __len__(self) -> int:
+        return len(self._map) if self._map is not None else 0
+
+    @property
+    def buffer(self):
+        """The raw bytes of the file, without copying them."""
+        return self._map if self._map is not None else b''
+
+    def __getitem__(self, item: slice) -> str:
+        if self._map is None:
+            return ''
+        return _normalize(self._map[item].decode(self._encoding))
+
+    def raw(self, start: int, end: int) -> bytes:
+        """The undecoded bytes between two offsets."""
+        return self._map[start:end] if self._map is not None else b''
+
+    def candidates(self):
+        """Yield the start offset, end offset and decoded text of each line in the file that could be a version
+        heading or a link."""
+
+        if self._map is None:
+            return
+        for match in _CANDIDATE_BYTES.finditer(self._map):
+            yield match.start(), match.end(), _normalize(match[0].decode(self._encoding))
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from ._defaults import DEFAULT_CACHE_PATH
+
+__all__ = ['ParseCache', 'DEFAULT_CACHE_PATH']
+
+# Bump this whenever the layout of a cached index changes so stale cache files are discarded.
+_FORMAT = 1
+
+
+class ParseCache:
+    """A persistent, on-disk store of change log indexes (the version list, link table and section offsets) so a
+    file that hasn't changed doesn't need to be scanned again. Entries are validated against the file's path, size,
+    modification time and a hash of its contents. Once there are more than maxEntries entries the oldest are evicted,
+    and entries older than maxAge seconds are ignored and evicted."""
+
+    __slots__ = '_path', '_maxEntries', '_maxAge', '_entries'
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, maxEntries: int = 64, maxAge: float = 7 * 24 * 60 * 60):
+        if maxEntries < 1:
+            raise ValueError('maxEntries must be a positive integer')
+
+        self._path = path
+        self._maxEntries = maxEntries
+        self._maxAge = maxAge
+        self._entries = None
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @staticmethod
+    def _key(changelog: str, kind: str) -> str:
+        return f'{os.path.realpath(changelog)}:{kind}'
+
+    @staticmethod
+    def _digest(buffer) -> str:
+        return hashlib.blake2b(buffer, digest_size=20).hexdigest()
+
+    def _load(self) -> dict:
+        if self._entries is None:
+            try:
+                with open(self._path, 'r') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = None
+
+            entries = None
+            if isinstance(data, dict) and data.get('format') == _FORMAT:
+                entries = data.get('entries')
+            self._entries = entries if isinstance(entries, dict) else {}
+
+        return self._entries
+
+    def _save(self):
+        # Write to a temporary file and swap it in so a concurrent reader never sees a partial file.
+        # Threads of the same process each write their own temporary file.
+        tempPath = f'{self._path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(tempPath, 'w') as f:
+                json.dump({'format': _FORMAT, 'entries': self._entries}, f)
+            os.replace(tempPath, self._path)
+        except OSError:
+            # The cache is only an optimization, failing to write it shouldn't fail parsing.
+            try:
+                os.remove(tempPath)
+            except OSError:
+                pass
+
+    def _evict(self, now: float):
+        entries = self._entries
+        for key in [k for k, e in entries.items() if now - e['created'] > self._maxAge]:
+            del entries[key]
+
+        if len(entries) > self._maxEntries:
+            oldest = sorted(entries, key=lambda k: entries[k]['created'])
+            for key in oldest[:len(entries) - self._maxEntries]:
+                del entries[key]
+
+    def get(self, changelog: str, kind: str, buffer) -> dict | None:
+        """Return the cached index for changelog if it is still valid, otherwise None. The buffer must contain the
+        current contents of the file."""
+
+        entry = self._load().get(self._key(changelog, kind))
+        if entry is None:
+            return None
+
+        try:
+            stat = os.stat(changelog)
+            if (entry['size'] != stat.st_size or entry['mtime'] != stat.st_mtime_ns
+                    or time.time() - entry['created'] > self._maxAge):
+                return None
+            if entry['digest'] != self._digest(buffer):
+                return None
+            return entry['index']
+        except (OSError, KeyError, TypeError):
+            return None
+
+    def put(self, changelog: str, kind: str, buffer, index: dict):
+        """Store the index for changelog, whose contents are in buffer, and write the cache file."""
+
+        entries = self._load()
+        stat = os.stat(changelog)
+        now = time.time()
+        entries[self._key(changelog, kind)] = {
+            'size': stat.st_size,
+            'mtime': stat.st_mtime_ns,
+            'digest': self._digest(buffer),
+            'created': now,
+            'index': index,
+        }
+        self._evict(now)
+        self._save()
+
+    def clear(self):
+        """Remove every entry and delete the cache file."""
+
+        self._entries = {}
+        try:
+            os.remove(self._path)
+        except FileNotFoundError:
+            pass
@@ -1,10 +1,22 @@
+import functools
+import os
 import re
+import time
+from bisect import bisect_left, bisect_right
 
-from ._pattern import DELIMITER, LINK, CHANGE
-from .version import Unreleased, SemanticVersion
+from ._pattern import DELIMITER, ENTRY, LINK, LINK_LINE, TAG_HEADING
+from ._source import MappedSource, byteOffsets, decode, encode, iterCandidates
+from ._timing import TimedLines, profiles, record, timed
+from .version import Unreleased, SemanticVersion, InvalidSemanticVersion
 
+# Most uses of the package, the command line included, only parse change logs. The modules needed to cache, search,
+# snapshot, edit or write them are imported by the functions that use them, so they don't slow down starting up.
 
-__all__ = ['ChangelogFormatException', 'Changes', 'Changelog']
+
+__all__ = ['ChangelogFormatException', 'Changes', 'Entries', 'Changelog', 'extractChanges', 'agather']
+
+# TAG_HEADING for the byte sections of a memory mapped change log
+_TAG_HEADING_BYTES = re.compile(TAG_HEADING.pattern.encode(), re.IGNORECASE | re.DOTALL)
 
 
 class ChangelogFormatException(Exception):
@@ -12,8 +24,41 @@ class ChangelogFormatException(Exception):
         super().__init__(*args)
 
 
+class Entries:
+    """A read-only sequence of the bulleted entries of one change tag. Only the (start, end) offsets of each entry in
+    the tag's content are stored, and an entry's text is sliced from the content when it's accessed."""
+
+    __slots__ = '_content', '_spans'
+
+    def __init__(self, content: str, spans: list[tuple[int, int]]):
+        self._content = content
+        self._spans = spans
+
+    @property
+    def spans(self) -> list[tuple[int, int]]:
+        """The (start, end) offsets of each entry's text in the content of the tag."""
+        return self._spans
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def __getitem__(self, item: int | slice) -> str | list[str]:
+        if isinstance(item, slice):
+            return [self._content[start:end] for start, end in self._spans[item]]
+        start, end = self._spans[item]
+        return self._content[start:end]
+
+    def __iter__(self):
+        content = self._content
+        for start, end in self._spans:
+            yield content[start:end]
+
+    def __repr__(self) -> str:
+        return f'Entries({list(self)})'
+
+
 class Changes:
-    __slots__ = '_added', '_changed', '_deprecated', '_removed', '_fixed', '_security'
+    __slots__ = '_added', '_changed', '_deprecated', '_removed', '_fixed', '_security', '_entries'
 
     def __init__(self, contents: str):
         if not isinstance(contents, str):
@@ -25,27 +70,39 @@ class Changes:
         self._removed = {}
         self._fixed = {}
         self._security = {}
+        self._entries = {}
 
         self._parseTags(contents)
 
+    _TAG_SLOTS = {'added': '_added', 'changed': '_changed', 'deprecated': '_deprecated', 'removed': '_removed',
+                  'fixed': '_fixed', 'security': '_security'}
+
+    @classmethod
+    def fromDict(cls, data: dict) -> 'Changes':
+        """Create Changes from a dict in the form returned by toDict."""
+
+        changes = cls.__new__(cls)
+        for tag, slot in cls._TAG_SLOTS.items():
+            setattr(changes, slot, dict(data.get(tag) or {}))
+        changes._entries = {}
+
+        return changes
+
+    @timed('changes', lambda args, result: len(args[1]))
     def _parseTags(self, contents):
-        while contents:
-            match = re.match(CHANGE, contents, re.IGNORECASE | re.DOTALL)
+        position, length = 0, len(contents)
+        while position < length:
+            match = TAG_HEADING.match(contents, position)
             if not match:
                 raise ValueError('unable to parse version changes')
-            if re.match(f'{match[2]}', 'added', re.IGNORECASE):
-                self._added = {'tag_raw': match[1], 'content': match[3]}
-            elif re.match(f'{match[2]}', 'changed', re.IGNORECASE):
-                self._changed = {'tag_raw': match[1], 'content': match[3]}
-            elif re.match(f'{match[2]}', 'deprecated', re.IGNORECASE):
-                self._deprecated = {'tag_raw': match[1], 'content': match[3]}
-            elif re.match(f'{match[2]}', 'removed', re.IGNORECASE):
-                self._removed = {'tag_raw': match[1], 'content': match[3]}
-            elif re.match(f'{match[2]}', 'fixed', re.IGNORECASE):
-                self._fixed = {'tag_raw': match[1], 'content': match[3]}
-            elif re.match(f'{match[2]}', 'security', re.IGNORECASE):
-                self._security = {'tag_raw': match[1], 'content': match[3]}
-            contents = contents.replace(match[0], '')
+            # A tag's content runs until the next '##' or the end of the section, the same as the lookahead in
+            # _pattern.CHANGE. Searching for it directly keeps parsing linear in the size of the section.
+            end = contents.find('##', match.end())
+            if end == -1:
+                end = length
+            setattr(self, self._TAG_SLOTS[match['tag_name'].lower()],
+                    {'tag_raw': match[0], 'content': contents[match.end():end]})
+            position = end
 
     def __str__(self) -> str:
         return str(self.toDict())
@@ -80,22 +137,139 @@ class Changes:
     def security(self) -> dict:
         return self._security
 
+    def entries(self, tag: str) -> Entries:
+        """Return the bulleted entries of a change tag, e.g. changes.entries('fixed'). An entry runs from its bullet
+        to the end of its last line, including indented continuation lines, and its text excludes the bullet. The
+        offsets of the entries are found the first time a tag's entries are requested."""
+
+        entries = self._entries.get(tag)
+        if entries is None:
+            slot = self._TAG_SLOTS.get(tag)
+            if slot is None:
+                raise ValueError(f'unknown change tag: {tag!r}')
+            content = getattr(self, slot).get('content', '')
+            spans = []
+            for match in ENTRY.finditer(content):
+                start, end = match.span('text')
+                # Leave out trailing whitespace without slicing the entry.
+                while end > start and content[end - 1] in ' \t\r':
+                    end -= 1
+                spans.append((start, end))
+            entries = self._entries[tag] = Entries(content, spans)
+
+        return entries
+
+    def iterEntries(self):
+        """Yield the tag and text of every entry, in the order of the tags in toDict."""
+
+        for tag in self._TAG_SLOTS:
+            for entry in self.entries(tag):
+                yield tag, entry
+
     def toDict(self) -> dict:
         return {'added': self._added, 'changed': self._changed, 'deprecated': self._deprecated,
                 'removed': self._removed, 'fixed': self._fixed, 'security': self._security}
 
 
 class Changelog:
-    __slots__ = '_links', '_versions', '_changes'
-
-    def __init__(self, changelog: str):
-        with open(changelog, 'r') as f:
-            contents = f.readlines()
+    __slots__ = ('_links', '_versions', '_changes', '_sections', '_source', '_sortedKeys', '_sortedVersions', '_path',
+                 '_lazy', '_cache', '_searchIndex', '_digests')
+
+    def __init__(self, changelog: str, lazy: bool = False, memoryMap: bool = False,
+                 cache: 'ParseCache | str | os.PathLike | None' = None):
+        """Parse the change log at the given path. If lazy is True only the boundaries of each version's section
+        are recorded here, and the Changes for a version are parsed the first time they are accessed. If memoryMap
+        is True the file is read through mmap instead of into memory, and sections are indexed by byte offsets and
+        decoded only when needed. If cache is a ParseCache, or the path to a cache file, the index of the file is
+        loaded from it when the file hasn't changed, and stored in it otherwise."""
+
+        if cache is not None:
+            from .cache import ParseCache
+
+            if not isinstance(cache, ParseCache):
+                cache = ParseCache(cache)
+
+        self._path = changelog
+        self._lazy = lazy
+        self._cache = cache
+        self._source, buffer = self._read(changelog, memoryMap)
+        self._indexSource(buffer)
+
+        if not lazy:
+            for version in self._sections:
+                self._changes[version] = self._loadChanges(version)
+
+    @classmethod
+    async def aload(cls, changelog: str, executor=None, **kwargs) -> 'Changelog':
+        """Load a change log without blocking the event loop, reading and parsing it in executor, or the loop's
+        default thread pool if it's None. The keyword arguments are passed on to Changelog. Parsing holds the GIL,
+        so a ProcessPoolExecutor keeps large files from slowing the loop down at all, though the change log is then
+        pickled back, which a memory mapped one can't be. Cancelling the load discards the change log, a parse that
+        already started still runs to the end in the executor."""
+
+        # asyncio is only imported by aload and agather, it's slow to import and most users of the package don't
+        # need it.
+        import asyncio
+
+        return await asyncio.get_running_loop().run_in_executor(executor, functools.partial(cls, changelog, **kwargs))
+
+    @timed('read', lambda args, result: len(result[1]))
+    @staticmethod
+    def _read(changelog: str, memoryMap: bool) -> tuple[str | MappedSource, bytes]:
+        """Return the source of the change log and the raw bytes it was decoded from."""
+
+        if memoryMap:
+            source = MappedSource(changelog)
+            return source, source.buffer
+
+        with open(changelog, 'rb') as f:
+            buffer = f.read()
+        return decode(buffer), buffer
+
+    def _indexSource(self, buffer):
+        """Reset the index and build it from the current source, or load it from the cache."""
 
         self._versions = []
         self._links = {}
         self._changes = {}
-        self._parseChangelog(contents)
+        self._sections = {}
+        self._sortedKeys = self._sortedVersions = None
+        self._searchIndex = None
+
+        source, cache = self._source, self._cache
+        memoryMap = isinstance(source, MappedSource)
+        if cache is None:
+            self._parseChangelog(source.candidates() if memoryMap else iterCandidates(source), len(source))
+        else:
+            kind = 'bytes' if memoryMap else 'text'
+            index = cache.get(self._path, kind, buffer)
+            if index is not None:
+                try:
+                    self._loadIndex(index)
+                except (KeyError, TypeError, ValueError, InvalidSemanticVersion):
+                    # The entry is malformed, parse the file and replace it.
+                    index = None
+            if index is None:
+                self._parseChangelog(source.candidates() if memoryMap else iterCandidates(source), len(source))
+                cache.put(self._path, kind, buffer, self._index())
+
+        # A memory mapped file shows edits made to it in place, so what it held when it was indexed is kept as
+        # digests rather than read from the mapping again.
+        self._digests = _sectionDigests(source, self._sections) if memoryMap else None
+
+    def close(self):
+        """Release the memory map of a change log read with memoryMap, or loaded from a memory mapped snapshot.
+        Changes that haven't been parsed yet can't be read afterwards. Closing a change log read into memory does
+        nothing."""
+
+        if isinstance(self._source, MappedSource) or self._path is None:
+            self._source.close()
+
+    def __enter__(self) -> 'Changelog':
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
 
     def _checkLink(self, line):
         match = LINK.match(line)
@@ -118,34 +292,479 @@ class Changelog:
 
         return version
 
-    def _parseChangelog(self, contents: list[str]):
-        body = contents
-        firstVersion = None
-        for i, line in enumerate(contents):
-            if self._checkLink(line):
+    @timed('scan', lambda args, result: args[2])
+    def _parseChangelog(self, lines, length: int):
+        """Record the versions, links and the (start, end) offsets of each version's section from an iterable of
+        (start, end, line) tuples. Only the lines starting with '#' or '[' are needed, the text between them is
+        only looked at to tell whether a run of link lines is followed by anything else."""
+
+        currentVersion = linkStart = None
+        start = linkEnd = 0
+        for offset, stop, line in lines:
+            first = line[:1]
+            if first == '[' and self._checkLink(line):
+                # Remember where a run of link lines starts so the link table isn't included in a section.
+                if linkStart is None or self._source[linkEnd:offset].strip():
+                    linkStart = offset
+                linkEnd = stop
                 continue
-            match = DELIMITER.match(line)
-            if match:
-                firstVersion = self._addVersion(match)
-                body = contents[i+1:]
-                break
+            if first == '#' and (match := DELIMITER.match(line)):
+                if currentVersion is not None:
+                    self._sections[currentVersion] = (start, self._sectionEnd(offset, linkStart, linkEnd))
+                currentVersion = self._addVersion(match)
+                start = stop
+            linkStart = None
 
-        if firstVersion is None:
+        if currentVersion is None:
             raise ChangelogFormatException('no versions found in changelog')
-        currentVersion = firstVersion
-
-        changes = ''
-        for line in body:
-            if match := DELIMITER.match(line):
-                self._changes[currentVersion] = Changes(changes.strip())
-                currentVersion = self._addVersion(match)
-                changes = ''
-            elif self._checkLink(line):
+        self._sections[currentVersion] = (start, self._sectionEnd(length, linkStart, linkEnd))
+
+    def _sectionEnd(self, end: int, linkStart: int | None, linkEnd: int) -> int:
+        # Stop before a run of link lines if only blank lines follow it.
+        if linkStart is not None and not self._source[linkEnd:end].strip():
+            return linkStart
+        return end
+
+    def _index(self) -> dict:
+        """Return the versions, links and section offsets in a form that can be serialized."""
+
+        return {'versions': [str(v) for v in self._versions],
+                'links': [[str(v), url] for v, url in self._links.items()],
+                'sections': [[str(v), start, end] for v, (start, end) in self._sections.items()]}
+
+    def _loadIndex(self, index: dict):
+        """Load an index returned by _index. Nothing is changed if it's malformed."""
+
+        versions = [SemanticVersion(v) for v in index['versions']]
+        links = {SemanticVersion(v): url for v, url in index['links']}
+        sections = {}
+        for version, start, end in index['sections']:
+            if not 0 <= start <= end <= len(self._source):
+                raise ValueError(f'invalid section {start}:{end} of {version}')
+            sections[SemanticVersion(version)] = (start, end)
+
+        self._versions, self._links, self._sections = versions, links, sections
+
+    def _loadChanges(self, version: SemanticVersion) -> Changes:
+        """Parse the Changes for a version from its section of the source."""
+
+        # Only a change log loaded from a snapshot has no path.
+        if self._path is None:
+            try:
+                return Changes.fromDict(self._source.changes(self._sections[version][0]))
+            except ValueError as e:
+                raise ChangelogFormatException(f'invalid snapshot: {e}') from e
+
+        start, end = self._sections[version]
+        return Changes(LINK_LINE.sub('', self._source[start:end]).strip())
+
+    def _getChanges(self, version: SemanticVersion) -> Changes:
+        changes = self._changes.get(version)
+        if changes is None:
+            changes = self._changes[version] = self._loadChanges(version)
+
+        return changes
+
+    def refresh(self) -> bool:
+        """Read the change log again after its file has been edited. Only the heading and link lines are scanned
+        again, and the Changes already parsed for a version are reused when the text of its section is unchanged, so
+        only the sections that were added or edited, usually the ones at the top of the file, are parsed again.
+        Returns False, leaving the change log as it was, if the contents of the file haven't changed."""
+
+        if self._path is None:
+            raise TypeError('a change log loaded from a snapshot cannot be refreshed')
+
+        oldSource, oldSections, oldChanges, oldDigests = self._source, self._sections, self._changes, self._digests
+        state = (self._versions, self._links, self._sections, self._changes, self._sortedKeys, self._sortedVersions,
+                 self._searchIndex, self._digests)
+
+        def restore():
+            self._source = oldSource
+            (self._versions, self._links, self._sections, self._changes, self._sortedKeys, self._sortedVersions,
+             self._searchIndex, self._digests) = state
+
+        mapped = isinstance(oldSource, MappedSource)
+        source, buffer = self._read(self._path, mapped)
+        if not mapped and source == oldSource:
+            return False
+
+        # The old mapping may already show the new contents of the file, or fault if the file shrank, so a mapped
+        # change log is compared with the digests taken when it was indexed and the old mapping is never read.
+        self._source = source
+        try:
+            self._indexSource(buffer)
+        except Exception:
+            if mapped:
+                source.close()
+            restore()
+            raise
+        if mapped and self._sections == oldSections and self._digests == oldDigests:
+            source.close()
+            restore()
+            return False
+
+        for version, (start, end) in self._sections.items():
+            changes = oldChanges.get(version)
+            if changes is None:
                 continue
+            if mapped:
+                unchanged = oldDigests.get(version) == self._digests[version]
+            else:
+                oldStart, oldEnd = oldSections[version]
+                unchanged = oldEnd - oldStart == end - start and oldSource[oldStart:oldEnd] == source[start:end]
+            if unchanged:
+                self._changes[version] = changes
+
+        if isinstance(oldSource, MappedSource):
+            oldSource.close()
+        if not self._lazy:
+            self._changes = {version: self._getChanges(version) for version in self._sections}
+
+        return True
+
+    def dump(self, path: str | os.PathLike):
+        """Write a binary snapshot of the change log to path, which loadSnapshot can load without parsing the change
+        log again. It holds the versions in file order, the changes of each version and the links, and is written to
+        a temporary file first so a partial snapshot is never seen at path."""
+
+        from ._snapshot import encode as encodeSnapshot
+
+        rows = [(str(version), self._getChanges(version).toDict()) for version in self._versions]
+        _writeAtomic(path, encodeSnapshot(rows, [(str(version), url) for version, url in self._links.items()]))
+
+    def _prepareEdit(self) -> str:
+        """Refresh the change log so an edit applies to the file as it is now, and return its line ending."""
+
+        if self._path is None:
+            raise TypeError('a change log loaded from a snapshot cannot be edited')
+        self.refresh()
+
+        with open(self._path, 'rb') as f:
+            return '\r\n' if f.readline().endswith(b'\r\n') else '\n'
+
+    def _native(self, text: str, newline: str) -> str | bytes:
+        # Text inserted into a memory mapped source is spliced as bytes.
+        return encode(text, newline) if isinstance(self._source, MappedSource) else text
+
+    def _splice(self, edits: list[tuple[int, int, str | bytes]], newline: str) -> bytes:
+        """Replace the (start, end) ranges of the source with text in the units of the source, copying the rest of
+        it as it is, and write the result to the file. The caller updates the index to match the new source. Raises
+        OSError without writing anything if the file no longer holds the source."""
+
+        source = self._source
+        # The offsets must still match the file, which could have been written since it was indexed.
+        if isinstance(source, MappedSource) and _sectionDigests(source, self._sections) != self._digests:
+            raise OSError(f'{self._path} was changed while it was being edited, nothing was written')
+
+        pieces = []
+        position = 0
+        for start, end, text in sorted(edits):
+            pieces += [_raw(source, position, start), text]
+            position = end
+        pieces.append(_raw(source, position, len(source)))
+
+        if not isinstance(source, MappedSource):
+            # The offsets are into the decoded text, the file is spliced at the same places in its undecoded bytes
+            # so the line endings and encoding of the rest of it are kept.
+            with open(self._path, 'rb') as f:
+                buffer = f.read()
+            if decode(buffer) != source:
+                raise OSError(f'{self._path} was changed while it was being edited, nothing was written')
+            edits = sorted(edits)
+            offsets = byteOffsets(buffer, source, [offset for start, end, _ in edits for offset in (start, end)])
+            chunks = []
+            position = 0
+            for (_, _, text), start, end in zip(edits, offsets[::2], offsets[1::2]):
+                chunks += [buffer[position:start], encode(text, newline)]
+                position = end
+            chunks.append(buffer[position:])
+
+            data = b''.join(chunks)
+            _writeAtomic(self._path, data)
+            self._source = ''.join(pieces)
+            return data
+
+        data = b''.join(pieces)
+        # A memory mapped file can't be replaced on Windows, the file is mapped again whether or not writing works.
+        source.close()
+        try:
+            _writeAtomic(self._path, data)
+        finally:
+            self._source = MappedSource(self._path)
+        return data
+
+    def _edited(self, data: bytes, versions: list[SemanticVersion]):
+        """Reset what depends on the source after an edit and parse the changes of the edited versions again."""
+
+        for version in versions:
+            self._changes.pop(version, None)
+        self._sortedKeys = self._sortedVersions = None
+        self._searchIndex = None
+        if isinstance(self._source, MappedSource):
+            self._digests = _sectionDigests(self._source, self._sections)
+
+        if self._cache is not None:
+            kind = 'bytes' if isinstance(self._source, MappedSource) else 'text'
+            self._cache.put(self._path, kind, data, self._index())
+        if not self._lazy:
+            self._changes = {version: self._getChanges(version) for version in self._sections}
+
+    def _findUnreleasedLink(self, url: str) -> re.Match | None:
+        """Find the link definition line of Unreleased, looking in the link table after the last section first."""
+
+        pattern = rf'^\[[Uu]nreleased]:[ \t]+(?P<url>{re.escape(url)})[ \t]*(?=\r?\n|\Z)'
+        if isinstance(self._source, MappedSource):
+            pattern, buffer = re.compile(encode(pattern), re.MULTILINE), self._source.buffer
+        else:
+            pattern, buffer = re.compile(pattern, re.MULTILINE), self._source
+
+        for position in (max(end for _, end in self._sections.values()), 0):
+            match = pattern.search(buffer, position)
+            if match:
+                return match
+
+        return None
+
+    def release(self, version: str | SemanticVersion, date=None):
+        """Release the Unreleased changes as version on date, a datetime.date or an ISO 8601 string that defaults
+        to today. A heading for the version is inserted below the Unreleased heading, which is left as it is, so
+        the Unreleased section is empty afterwards. If the Unreleased link compares the latest release to HEAD, as
+        in .../compare/v1.1.1...HEAD, it's changed to compare the new version to HEAD and a link comparing the
+        latest release to the new version is added below it.
+
+        Only the inserted and changed lines are written, the rest of the file is copied as it is, and the offsets of
+        the other sections are moved rather than found by scanning the file again. The file is written to a
+        temporary file first and then renamed over the change log."""
+
+        if isinstance(version, str):
+            version = SemanticVersion(version)
+        if not isinstance(version, SemanticVersion):
+            raise TypeError('version must be a str or SemanticVersion type')
+        if version is Unreleased:
+            raise ValueError('cannot release a version named Unreleased')
+        import datetime
+
+        if date is None:
+            date = datetime.date.today()
+        elif isinstance(date, str):
+            date = datetime.date.fromisoformat(date)
+
+        newline = self._prepareEdit()
+        if version in self._sections:
+            raise ValueError(f'version ({version}) is already in the changelog')
+        if Unreleased not in self._sections:
+            raise ChangelogFormatException('no Unreleased section found in changelog')
+
+        start, end = self._sections[Unreleased]
+        # The Unreleased heading could be the last line of the file without a newline.
+        blank = self._native('\n', newline)
+        separator = blank if _raw(self._source, start - 1, start) in ('\n', b'\n', b'\r') else blank * 2
+        heading = separator + self._native(f'## [{version}] - {date.isoformat()}\n', newline)
+        edits = [(start, start, heading)]
+
+        links = None
+        latest = max((v for v in self._versions if v is not Unreleased), key=SemanticVersion.sortKey, default=None)
+        url = self._links.get(Unreleased)
+        if latest is not None and url:
+            links = _releaseLinks(url.strip(), latest, version)
+            match = self._findUnreleasedLink(url) if links else None
+            if match:
+                edits.append((match.start('url'), match.end('url'),
+                              self._native(f'{links[0]}\n[{version}]: {links[1]}', newline)))
+            else:
+                links = None
+
+        data = self._splice(edits, newline)
+
+        # The new version takes over the contents of the Unreleased section.
+        sections = {}
+        for v, (s, e) in self._sections.items():
+            if v is Unreleased:
+                sections[v] = (start + len(separator) - len(blank), start + len(separator))
+                # The heading is inserted at the start of the section, so it moves the end of the section even when
+                # the section is empty, as it is when the Unreleased heading ends the file.
+                sections[version] = (start + len(heading), _shift(e, edits[1:]) + len(heading))
+            else:
+                sections[v] = (_shift(s, edits), _shift(e, edits))
+        self._sections = sections
+        self._versions.insert(self._versions.index(Unreleased) + 1, version)
+
+        changes = self._changes.get(Unreleased)
+        if changes is not None:
+            self._changes[version] = changes
+        if links is not None:
+            items = []
+            for v, l in self._links.items():
+                if v is Unreleased:
+                    items += [(v, links[0]), (version, links[1])]
+                else:
+                    items.append((v, l))
+            self._links = dict(items)
+
+        self._edited(data, [Unreleased])
+
+    def addEntry(self, tag: str, text: str, version: str | SemanticVersion = Unreleased):
+        """Add an entry to the end of a change tag of a version, Unreleased by default. If the version doesn't have
+        the tag yet a heading for it is added, keeping the tags in the order of the Keep a Changelog format. Lines
+        after the first line of text are indented so they're part of the same entry. The file is written the same
+        way as by release."""
+
+        tags = list(Changes._TAG_SLOTS)
+        tag = tag.lower()
+        if tag not in tags:
+            raise ValueError(f'unknown change tag: {tag}')
+        entry = _entryText(text)
+        if isinstance(version, str):
+            version = SemanticVersion(version)
+        if not isinstance(version, SemanticVersion):
+            raise TypeError('version must be a str or SemanticVersion type')
+
+        newline = self._prepareEdit()
+        if version not in self._sections:
+            raise ValueError(f'version ({version}) not found in changelog')
+
+        start, end = self._sections[version]
+        section = _raw(self._source, start, end)
+        pattern, heading = (_TAG_HEADING_BYTES, b'##') if isinstance(section, bytes) else (TAG_HEADING, '##')
+
+        # The (tag, heading start, content start, content end) of each tag, the same way Changes parses them.
+        blocks = []
+        position = 0
+        while match := pattern.search(section, position):
+            position = section.find(heading, match.end())
+            if position == -1:
+                position = len(section)
+            name = match['tag_name']
+            blocks.append((name.decode('ascii') if isinstance(name, bytes) else name, match.start(), match.end(),
+                           position))
+
+        for name, headingStart, contentStart, contentEnd in blocks:
+            if name.lower() == tag:
+                content = section[contentStart:contentEnd].rstrip()
+                if content:
+                    offset, insert = contentStart + len(content), f'\n{entry}'
+                else:
+                    offset, insert = contentStart, f'\n{entry}\n'
+                break
+            if tags.index(name.lower()) > tags.index(tag):
+                offset, insert = headingStart, f'### {tag.capitalize()}\n\n{entry}\n\n'
+                break
+        else:
+            content = section.rstrip()
+            if content:
+                offset, insert = len(content), f'\n\n### {tag.capitalize()}\n\n{entry}'
             else:
-                changes += line
+                offset, insert = 0, f'\n### {tag.capitalize()}\n\n{entry}\n'
+
+        edits = [(start + offset, start + offset, self._native(insert, newline))]
+        # The heading could be the last line of the file without a newline, which the inserted text ends.
+        sectionStart = start
+        if _raw(self._source, start - 1, start) not in ('\n', b'\n', b'\r'):
+            sectionStart += len(self._native('\n', newline))
+
+        data = self._splice(edits, newline)
+        self._sections = {v: (sectionStart, end + len(edits[0][2])) if v == version else
+                          (_shift(s, edits), _shift(e, edits)) for v, (s, e) in self._sections.items()}
+        self._edited(data, [version])
+
+    @classmethod
+    def loadSnapshot(cls, path: str | os.PathLike, lazy: bool = True, memoryMap: bool = False) -> 'Changelog':
+        """Load a change log from a snapshot written by dump. Only the version and link tables are read here, and if
+        lazy is True the changes of a version are decoded the first time they are accessed. If memoryMap is True the
+        snapshot is read through mmap instead of into memory. A change log loaded from a snapshot can't be
+        refreshed."""
+
+        from ._snapshot import SnapshotReader
+
+        reader = None
+        try:
+            reader = SnapshotReader(path, memoryMap)
+            versions = [SemanticVersion(v) for v in reader.versions()]
+            links = {SemanticVersion(v): url for v, url in reader.links()}
+        except (ValueError, InvalidSemanticVersion) as e:
+            if reader is not None:
+                reader.close()
+            raise ChangelogFormatException(f'invalid snapshot: {e}') from e
+
+        self = cls.__new__(cls)
+        self._path = None
+        self._lazy = lazy
+        self._cache = None
+        self._source = reader
+        self._versions = versions
+        self._links = links
+        # Sections are (start, end) rows of the snapshot's version table rather than offsets into the source.
+        self._sections = {version: (row, row + 1) for row, version in enumerate(versions)}
+        self._changes = {}
+        self._sortedKeys = self._sortedVersions = None
+        self._searchIndex = None
+        self._digests = None
+
+        if not lazy:
+            try:
+                self._changes = {version: self._getChanges(version) for version in self._sections}
+            except ChangelogFormatException:
+                reader.close()
+                raise
+
+        return self
+
+    def _sortedIndex(self) -> tuple[list[tuple], list[SemanticVersion]]:
+        """Return the precedence keys and versions of the change log sorted by precedence, regardless of the order
+        of the headings in the file."""
+
+        if self._sortedKeys is None:
+            self._sortedVersions = sorted(self._sections, key=SemanticVersion.sortKey)
+            self._sortedKeys = [version.precedence for version in self._sortedVersions]
+
+        return self._sortedKeys, self._sortedVersions
+
+    def _range(self, low: SemanticVersion | None, high: SemanticVersion | None, lowInclusive: bool,
+               highInclusive: bool) -> dict[SemanticVersion, Changes]:
+        keys, versions = self._sortedIndex()
+        if low is None:
+            start = 0
+        else:
+            start = (bisect_left if lowInclusive else bisect_right)(keys, low.precedence)
+        if high is None:
+            stop = len(keys)
+        else:
+            stop = (bisect_right if highInclusive else bisect_left)(keys, high.precedence)
+
+        # Newest first, the same way change logs are ordered.
+        return {version: self._getChanges(version) for version in reversed(versions[start:stop])}
+
+    @staticmethod
+    def _toVersion(version, name: str) -> SemanticVersion | None:
+        if version is None or isinstance(version, SemanticVersion):
+            return version
+        if isinstance(version, str):
+            return SemanticVersion(version)
+
+        raise TypeError(f'{name} must be a str or SemanticVersion type')
+
+    def between(self, low: str | SemanticVersion | None, high: str | SemanticVersion | None,
+                inclusive: bool = True) -> dict[SemanticVersion, Changes]:
+        """Return the Changes of every version between low and high by precedence, newest first. Either bound can
+        be None to leave that end of the range open, and inclusive determines whether the bounds themselves are
+        included."""
+
+        return self._range(self._toVersion(low, 'low'), self._toVersion(high, 'high'), inclusive, inclusive)
+
+    @property
+    def searchIndex(self) -> 'SearchIndex':
+        """The SearchIndex of the entries of every version, built the first time it's needed and again after the
+        change log is refreshed."""
+
+        if self._searchIndex is None:
+            from .search import SearchIndex
 
-        self._changes[currentVersion] = Changes(changes.strip())
+            self._searchIndex = SearchIndex.fromChangelog(self)
+        return self._searchIndex
+
+    def search(self, query: str, tags: list[str] | None = None, limit: int | None = None) -> 'list[SearchHit]':
+        """Return the entries matching a query, newest first. See SearchIndex for the query syntax."""
+        return self.searchIndex.search(query, tags, limit)
 
     @property
     def versions(self) -> list[SemanticVersion]:
@@ -153,17 +772,27 @@ class Changelog:
 
     @property
     def changes(self) -> dict[SemanticVersion, Changes]:
+        if len(self._changes) < len(self._sections):
+            self._changes = {version: self._getChanges(version) for version in self._sections}
         return self._changes
 
     @property
     def links(self) -> dict[SemanticVersion, str]:
         return self._links
 
-    def __getitem__(self, item: str | SemanticVersion) -> Changes:
+    def __getitem__(self, item: str | SemanticVersion | slice) -> Changes | dict[SemanticVersion, Changes]:
+        if isinstance(item, slice):
+            # Slices follow Python's convention of including the start and excluding the stop.
+            if item.step is not None:
+                raise ValueError('slices of a Changelog do not support a step')
+            return self._range(self._toVersion(item.start, 'slice start'), self._toVersion(item.stop, 'slice stop'),
+                               True, False)
         if isinstance(item, str):
             item = SemanticVersion(item)
         if isinstance(item, SemanticVersion):
-            return self._changes[item]
+            if item not in self._sections:
+                raise KeyError(item)
+            return self._getChanges(item)
 
         raise TypeError('item must be a str or SemanticVersion type')
 
@@ -171,7 +800,7 @@ class Changelog:
         if isinstance(item, str):
             item = SemanticVersion(item)
         if isinstance(item, SemanticVersion):
-            return item in self._versions
+            return item in self._sections
 
         raise TypeError('item must be a str or SemanticVersion type')
 
@@ -181,11 +810,14 @@ class Changelog:
         if not isinstance(version, SemanticVersion):
             raise TypeError('version must be a str or SemanticVersion type')
 
-        if version not in self._versions:
+        if version not in self._sections:
             raise ValueError(f'version ({version}) not found in changelog')
 
-        return {'version': version.toDict(), 'link': self._links.get(version) or '',
-                'changes': self._changes.get(version).toDict()}
+        return self._versionDict(version, self._getChanges(version), self._links.get(version))
+
+    @staticmethod
+    def _versionDict(version: SemanticVersion, changes: Changes, link: str | None) -> dict:
+        return {'version': version.toDict(), 'link': link or '', 'changes': changes.toDict()}
 
     def toDict(self) -> dict:
         rtn = {}
@@ -193,3 +825,183 @@ class Changelog:
             rtn[str(version)] = self.getVersion(version)
 
         return rtn
+
+    def iterDicts(self):
+        """Yield the same (version string, getVersion dict) items as toDict one at a time. Changes that haven't been
+        parsed yet aren't kept, so iterating over a lazy change log only holds one version's changes at a time."""
+
+        for version in dict.fromkeys(self._versions):
+            changes = self._changes.get(version) or self._loadChanges(version)
+            yield str(version), self._versionDict(version, changes, self._links.get(version))
+
+    def dumpJSON(self, fp):
+        """Write the same JSON as json.dump(self.toDict(), fp) to a text file, one version at a time."""
+
+        _writeJSONItems(self.iterDicts(), fp)
+
+
+async def agather(paths, limit: int = 8, executor=None, returnExceptions: bool = False, **kwargs) -> list:
+    """Load the change logs at paths concurrently with Changelog.aload, at most limit at a time, and return them in
+    the same order as paths. The keyword arguments are passed on to Changelog. If a change log can't be loaded the
+    ones still loading are cancelled and the exception is raised, unless returnExceptions is True, in which case
+    the exception takes the change log's place in the results. Cancelling agather, for example with
+    asyncio.wait_for, cancels every load, and the ones waiting for their turn never start."""
+
+    import asyncio
+
+    if limit < 1:
+        raise ValueError('limit must be a positive integer')
+
+    semaphore = asyncio.Semaphore(limit)
+
+    async def load(path):
+        async with semaphore:
+            return await Changelog.aload(path, executor, **kwargs)
+
+    tasks = [asyncio.ensure_future(load(path)) for path in paths]
+    try:
+        return await asyncio.gather(*tasks, return_exceptions=returnExceptions)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _raw(source: str | MappedSource, start: int, end: int) -> str | bytes:
+    # Sections are compared without decoding them.
+    return source.raw(start, end) if isinstance(source, MappedSource) else source[start:end]
+
+
+def _sectionDigests(source: MappedSource, sections: dict) -> dict:
+    """Return a digest of the bytes of each section of a memory mapped source, and of the bytes outside of every
+    section under None, so an edit anywhere in the file changes at least one of them. Each byte is hashed once."""
+
+    import hashlib
+
+    digests = {}
+    outside = hashlib.blake2b(digest_size=16)
+    position = 0
+    with memoryview(source.buffer) as view:
+        for version, (start, end) in sorted(sections.items(), key=lambda item: item[1]):
+            outside.update(view[position:start])
+            digests[version] = hashlib.blake2b(view[start:end], digest_size=16).digest()
+            position = end
+        outside.update(view[position:])
+    digests[None] = outside.digest()
+
+    return digests
+
+
+def _writeAtomic(path: str | os.PathLike, data: bytes):
+    """Write data to a temporary file next to path and rename it over path, so a partial file is never seen there.
+    The permissions of an existing file are kept."""
+
+    import threading
+
+    tempPath = f'{os.fspath(path)}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        with open(tempPath, 'wb') as f:
+            f.write(data)
+        try:
+            os.chmod(tempPath, os.stat(path).st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(tempPath, path)
+    except BaseException:
+        try:
+            os.remove(tempPath)
+        except OSError:
+            pass
+        raise
+
+
+def _writeJSONItems(items, fp):
+    """Write (version string, getVersion dict) items to a text file as a single JSON object, one at a time."""
+
+    import json
+
+    fp.write('{')
+    for i, (version, data) in enumerate(items):
+        fp.write(f'{", " if i else ""}{json.dumps(version)}: {json.dumps(data)}')
+    fp.write('}')
+
+
+def _shift(offset: int, edits: list[tuple[int, int, str | bytes]]) -> int:
+    """Move an offset outside of the edited ranges by the change in length of the edits before it."""
+    return offset + sum(len(text) - (end - start) for start, end, text in edits if start < offset)
+
+
+def _releaseLinks(url: str, previous: SemanticVersion, version: SemanticVersion) -> tuple[str, str] | None:
+    """Return the links of Unreleased and version after releasing version, if the link of Unreleased compares the
+    previous release to HEAD."""
+
+    match = re.search(rf'(?P<prefix>[vV]?){re.escape(str(previous))}(?P<separator>\.\.\.?)HEAD$', url)
+    if match is None:
+        return None
+
+    base, prefix, separator = url[:match.start()], match['prefix'], match['separator']
+    return f'{base}{prefix}{version}{separator}HEAD', f'{base}{prefix}{previous}{separator}{prefix}{version}'
+
+
+def _entryText(text: str) -> str:
+    lines = text.strip().splitlines()
+    if not lines:
+        raise ValueError('an entry cannot be empty')
+
+    # Indent the following lines so they continue the entry.
+    return '\n'.join([f'- {lines[0]}'] + [f'  {line}' if line.strip() else '' for line in lines[1:]])
+
+
+def _matchedVersion(match: re.Match) -> SemanticVersion:
+    return SemanticVersion(match['unreleased'] or match['version'])
+
+
+def extractChanges(changelog: str, version: str | SemanticVersion, link: bool = False) -> tuple[Changes, str]:
+    """Read the changes for a single version by streaming the change log line by line, stopping at the heading
+    after the version's section. If link is True the rest of the file is also scanned for the version's link
+    definition. Returns the Changes and the link, which is an empty string if it wasn't requested or found."""
+
+    if isinstance(version, str):
+        version = SemanticVersion(version)
+    if not isinstance(version, SemanticVersion):
+        raise TypeError('version must be a str or SemanticVersion type')
+
+    url = ''
+    foundAny = False
+    section = None
+    start = time.perf_counter()
+    with open(changelog, 'r') as f:
+        # The file is read as it's scanned, so the time spent reading lines is added up separately when profiling.
+        lines = TimedLines(f) if profiles.get() else f
+        for line in lines:
+            first = line[:1]
+            if first == '[' and (match := LINK.match(line)):
+                # Link lines are never part of a section's changes.
+                if _matchedVersion(match) == version:
+                    url = match['url']
+                continue
+            if first == '#' and (match := DELIMITER.match(line)):
+                if section is not None:
+                    break
+                foundAny = True
+                if _matchedVersion(match) == version:
+                    section = []
+                    url = match['url'] or url
+                continue
+            if section is not None:
+                section.append(line)
+
+        if link:
+            for line in lines:
+                if line[:1] == '[' and (match := LINK.match(line)) and _matchedVersion(match) == version:
+                    url = match['url']
+
+    if lines is not f:
+        record('read', lines.time, lines.size)
+        record('scan', time.perf_counter() - start - lines.time, lines.size)
+
+    if section is None:
+        if not foundAny:
+            raise ChangelogFormatException('no versions found in changelog')
+        raise KeyError(version)
+
+    return Changes(''.join(section).strip()), url if link else ''
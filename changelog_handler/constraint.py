@@ -0,0 +1,198 @@
+import re
+from bisect import bisect_left, bisect_right
+
+from ._pattern import DOTSEP_ID
+from .version import SemanticVersion, UNRELEASED_KEY, _precedenceKey
+
+__all__ = ['VersionConstraint', 'InvalidConstraint']
+
+
+class InvalidConstraint(Exception):
+    def __init__(self, *args):
+        super().__init__(*args)
+
+
+_WILDCARD = r'\d+|[xX*]'
+COMPARATOR = re.compile(rf'(?P<op>\^|~|>=|<=|>|<|==?)?\s*[Vv]?(?P<major>{_WILDCARD})(?:\.(?P<minor>{_WILDCARD})'
+                        rf'(?:\.(?P<patch>{_WILDCARD})(?:-(?P<pre_release>{DOTSEP_ID}))?(?:\+{DOTSEP_ID})?)?)?')
+HYPHEN_RANGE = re.compile(r'(?P<low>\S+)\s+-\s+(?P<high>\S+)')
+
+
+def _parsePartial(string: str) -> tuple[str, list[int], str]:
+    """Split a comparator into its operator, the version numbers given before any wildcard, and the pre-release."""
+
+    match = COMPARATOR.fullmatch(string)
+    if match is None:
+        raise InvalidConstraint(f'invalid version comparator: {string!r}')
+
+    numbers = []
+    for part in match.group('major', 'minor', 'patch'):
+        if part is None or not part.isdigit():
+            break
+        numbers.append(int(part))
+    preRelease = match['pre_release'] or ''
+    if preRelease and len(numbers) < 3:
+        raise InvalidConstraint(f'a pre-release requires a full version: {string!r}')
+
+    return match['op'] or '=', numbers, preRelease
+
+
+def _floor(numbers: list[int]) -> tuple:
+    """Key of the lowest release matching a partial version, e.g. 1.2 -> 1.2.0."""
+    return _precedenceKey(*(numbers + [0, 0, 0])[:3], '')
+
+
+def _ceiling(numbers: list[int]) -> tuple:
+    """Key just below every version after a partial version, e.g. 1.2 -> 1.3.0-0."""
+
+    bumped = numbers[:-1] + [numbers[-1] + 1]
+    return _precedenceKey(*(bumped + [0, 0, 0])[:3], '0')
+
+
+def _comparatorInterval(string: str) -> tuple:
+    """Convert a single comparator to a (low, lowInclusive, high, highInclusive) interval of precedence keys. A bound
+    of None is unbounded."""
+
+    if string in ('*', 'x', 'X'):
+        return None, True, None, True
+
+    op, numbers, preRelease = _parsePartial(string)
+    if not numbers:
+        if op in ('=', '=='):
+            return None, True, None, True
+        raise InvalidConstraint(f'invalid version comparator: {string!r}')
+
+    full = len(numbers) == 3
+    exact = _precedenceKey(*numbers, preRelease) if full else None
+
+    if op in ('=', '=='):
+        return (exact, True, exact, True) if full else (_floor(numbers), True, _ceiling(numbers), False)
+    if op == '>=':
+        return (exact if full else _floor(numbers)), True, None, True
+    if op == '>':
+        return (exact, False, None, True) if full else (_ceiling(numbers), True, None, True)
+    if op == '<=':
+        return (None, True, exact, True) if full else (None, True, _ceiling(numbers), False)
+    if op == '<':
+        return (None, True, exact, False) if full else (None, True, _precedenceKey(*_floor(numbers)[:3], '0'), False)
+
+    low = exact if full else _floor(numbers)
+    if op == '^':
+        # Changes to the left-most non-zero number aren't allowed.
+        significant = next((i for i, n in enumerate(numbers) if n), len(numbers) - 1)
+        high = _ceiling(numbers[:significant + 1])
+    else:
+        # Tilde allows patch changes if a minor version is given, otherwise minor changes.
+        high = _ceiling(numbers[:2])
+
+    return low, True, high, False
+
+
+def _intersect(intervals: list[tuple]) -> tuple | None:
+    low, lowInclusive, high, highInclusive = None, True, None, True
+    for lo, loInc, hi, hiInc in intervals:
+        if lo is not None and (low is None or lo > low or (lo == low and not loInc)):
+            low, lowInclusive = lo, loInc
+        if hi is not None and (high is None or hi < high or (hi == high and not hiInc)):
+            high, highInclusive = hi, hiInc
+
+    if low is not None and high is not None and (low > high or (low == high and not (lowInclusive
+                                                                                    and highInclusive))):
+        return None
+    return low, lowInclusive, high, highInclusive
+
+
+class VersionConstraint:
+    """A version specifier compiled into intervals of SemanticVersion precedence keys.
+
+    Comparators are separated by commas or whitespace and must all hold, and sets of comparators can be joined with
+    '||' where any must hold. Supported comparators are the operators =, ==, >, >=, < and <=, caret (^1.4) and tilde
+    (~2.1.0) ranges, wildcards (1.2.x, *), partial versions (1.2) and hyphen ranges (1.0.0 - 2.0.0). Unreleased never
+    matches a constraint."""
+
+    __slots__ = '_specifier', '_intervals'
+
+    def __init__(self, specifier: str):
+        if not isinstance(specifier, str):
+            raise TypeError('specifier must be a str type')
+
+        self._specifier = specifier
+        self._intervals = []
+        for alternative in specifier.split('||'):
+            alternative = alternative.strip()
+            if match := HYPHEN_RANGE.fullmatch(alternative):
+                comparators = [_comparatorInterval('>=' + match['low']), _comparatorInterval('<=' + match['high'])]
+            else:
+                # Allow whitespace between an operator and its version, e.g. '>= 1.0.0'.
+                alternative = re.sub(r'(\^|~|>=|<=|>|<|==?)\s+', r'\1', alternative)
+                parts = [p for p in re.split(r'[\s,]+', alternative) if p]
+                if not parts:
+                    raise InvalidConstraint(f'empty version constraint: {specifier!r}')
+                comparators = [_comparatorInterval(p) for p in parts]
+
+            interval = _intersect(comparators)
+            if interval is not None:
+                self._intervals.append(interval)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self._specifier!r})'
+
+    def __str__(self) -> str:
+        return self._specifier
+
+    @property
+    def intervals(self) -> list[tuple]:
+        """The (low, lowInclusive, high, highInclusive) precedence key intervals the constraint matches."""
+        return list(self._intervals)
+
+    @staticmethod
+    def _toVersion(version) -> SemanticVersion:
+        if isinstance(version, str):
+            return SemanticVersion(version)
+        if isinstance(version, SemanticVersion):
+            return version
+
+        raise TypeError('versions must be str or SemanticVersion types')
+
+    def matches(self, version: str | SemanticVersion) -> bool:
+        key = self._toVersion(version).precedence
+        if key == UNRELEASED_KEY:
+            return False
+
+        for low, lowInclusive, high, highInclusive in self._intervals:
+            if low is not None and (key < low or (key == low and not lowInclusive)):
+                continue
+            if high is not None and (key > high or (key == high and not highInclusive)):
+                continue
+            return True
+
+        return False
+
+    def __contains__(self, version: str | SemanticVersion) -> bool:
+        return self.matches(version)
+
+    def filter(self, versions) -> list[SemanticVersion]:
+        """Return the versions that satisfy the constraint, in their original order. The versions are sorted by
+        precedence key once and each interval is then selected with bisect, rather than comparing every version
+        against every bound."""
+
+        versions = [self._toVersion(v) for v in versions]
+        keys = [v.precedence for v in versions]
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        sortedKeys = [keys[i] for i in order]
+        # Unreleased sorts after everything and never matches.
+        end = bisect_left(sortedKeys, UNRELEASED_KEY)
+
+        selected = set()
+        for low, lowInclusive, high, highInclusive in self._intervals:
+            if low is None:
+                start = 0
+            else:
+                start = (bisect_left if lowInclusive else bisect_right)(sortedKeys, low, 0, end)
+            if high is None:
+                stop = end
+            else:
+                stop = (bisect_right if highInclusive else bisect_left)(sortedKeys, high, 0, end)
+            selected.update(order[start:stop])
+
+        return [versions[i] for i in sorted(selected)]
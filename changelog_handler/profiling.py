@@ -0,0 +1,95 @@
+import threading
+
+from ._timing import bind, profiles
+
+__all__ = ['Profile', 'PhaseStats', 'PHASES']
+
+# The phases of loading a change log, in the order they happen.
+PHASES = ('read', 'scan', 'version', 'changes')
+
+# The number of profiles active in any thread or task. The timed methods are only bound while it's above zero.
+_active = 0
+_activeLock = threading.Lock()
+
+
+class PhaseStats:
+    """The total wall time in seconds, number of calls and number of bytes (or characters) processed by one
+    phase."""
+
+    __slots__ = 'time', 'calls', 'bytes'
+
+    def __init__(self):
+        self.time = 0.0
+        self.calls = 0
+        self.bytes = 0
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(time={self.time}, calls={self.calls}, bytes={self.bytes})'
+
+    def toDict(self) -> dict:
+        return {'time': self.time, 'calls': self.calls, 'bytes': self.bytes}
+
+
+class Profile:
+    """Records the wall time, number of calls and bytes processed by each phase of loading change logs while it is
+    active as a context manager. The phases are:
+
+    - read: reading or memory mapping the file
+    - scan: finding the version headings and links, which includes the version phase for headings
+    - version: constructing a SemanticVersion, including ones found in the cache
+    - changes: parsing the change tags of a section
+
+    If callback is given it is called with the phase, the time in seconds and the size of each call as it happens.
+    Only the loads in the thread or asyncio task that entered the profile are recorded, along with the tasks it
+    starts while the profile is active, so profiles in other threads and tasks don't see each other's loads."""
+
+    __slots__ = '_phases', '_callback', '_token'
+
+    def __init__(self, callback=None):
+        self._phases = {phase: PhaseStats() for phase in PHASES}
+        self._callback = callback
+        self._token = None
+
+    @property
+    def phases(self) -> dict[str, PhaseStats]:
+        return self._phases
+
+    def _record(self, phase: str, elapsed: float, size: int):
+        stats = self._phases[phase]
+        stats.time += elapsed
+        stats.calls += 1
+        stats.bytes += size
+        if self._callback is not None:
+            self._callback(phase, elapsed, size)
+
+    def __enter__(self) -> 'Profile':
+        global _active
+
+        with _activeLock:
+            _active += 1
+            if _active == 1:
+                bind(True)
+        self._token = profiles.set(profiles.get() + (self,))
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        global _active
+
+        profiles.reset(self._token)
+        self._token = None
+        with _activeLock:
+            _active -= 1
+            if _active == 0:
+                bind(False)
+
+    def toDict(self) -> dict:
+        return {phase: stats.toDict() for phase, stats in self._phases.items()}
+
+    def report(self) -> str:
+        """Format the statistics of each phase as a table."""
+
+        lines = [f'{"phase":<10}{"calls":>10}{"time (ms)":>14}{"bytes":>14}']
+        for phase, stats in self._phases.items():
+            lines.append(f'{phase:<10}{stats.calls:>10}{stats.time * 1000:>14.3f}{stats.bytes:>14}')
+
+        return '\n'.join(lines)
@@ -0,0 +1,58 @@
+import os
+import pathlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import NamedTuple
+
+from .changelog import Changelog, ChangelogFormatException
+from .version import InvalidSemanticVersion
+
+__all__ = ['ChangelogSummary', 'summarize', 'scan']
+
+
+class ChangelogSummary(NamedTuple):
+    """A compact, picklable summary of a parsed change log. Section offsets are (start, end) character offsets into
+    the decoded file, or byte offsets if it was read with memoryMap. If the file couldn't be parsed error holds the
+    reason and the other fields are empty."""
+
+    path: str
+    versions: list[str]
+    links: dict[str, str]
+    sections: dict[str, tuple[int, int]]
+    error: str = ''
+
+
+def summarize(path: str | os.PathLike, memoryMap: bool = False) -> ChangelogSummary:
+    """Parse the change log at path and return its summary. Parsing errors are recorded in the summary instead of
+    being raised."""
+
+    path = str(path)
+    try:
+        index = Changelog(path, lazy=True, memoryMap=memoryMap)._index()
+    except (OSError, UnicodeDecodeError, ValueError, ChangelogFormatException, InvalidSemanticVersion) as e:
+        return ChangelogSummary(path, [], {}, {}, f'{e.__class__.__name__}: {e}')
+
+    return ChangelogSummary(path, index['versions'], dict(index['links']),
+                            {version: (start, end) for version, start, end in index['sections']})
+
+
+def scan(root: str | os.PathLike, pattern: str = '**/CHANGELOG.md', workers: int | None = None,
+         memoryMap: bool = False):
+    """Find every file under root matching the glob pattern and parse them in a pool of worker processes, yielding
+    a ChangelogSummary for each as soon as it is complete. The order of the results is therefore not deterministic.
+    Setting workers to 1 parses the files serially in this process."""
+
+    paths = sorted(p for p in pathlib.Path(root).glob(pattern) if p.is_file())
+    if workers == 1 or len(paths) < 2:
+        for path in paths:
+            yield summarize(path, memoryMap)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(summarize, path, memoryMap) for path in paths]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # Don't wait on files nobody will read if the caller stops iterating early.
+            for future in futures:
+                future.cancel()
@@ -0,0 +1,165 @@
+import json
+import re
+from typing import NamedTuple
+
+from .version import SemanticVersion
+
+__all__ = ['SearchIndex', 'SearchHit', 'tokenize']
+
+TOKEN = re.compile(r'\w+')
+# a tag filter, a quoted phrase or a bare term of a query
+QUERY_PART = re.compile(r'tag:(?P<tag>\S+)|"(?P<phrase>[^"]*)"?|(?P<term>\S+)', re.IGNORECASE)
+TAGS = ('added', 'changed', 'deprecated', 'removed', 'fixed', 'security')
+
+# Bump this whenever the layout of a saved index changes.
+_FORMAT = 1
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase words, ignoring punctuation, so '(#457)' is the token '457'."""
+    return TOKEN.findall(text.lower())
+
+
+class SearchHit(NamedTuple):
+    """An entry matching a search: its version, tag, position within the tag's entries and text."""
+
+    version: SemanticVersion
+    tag: str
+    position: int
+    entry: str
+
+
+class SearchIndex:
+    """An inverted index of the entries of a change log, mapping each token to the entries containing it and the
+    positions of the token within them.
+
+    Queries are made of terms, which must all appear in an entry, quoted phrases, whose tokens must appear
+    consecutively, and tag:name filters, which limit the results to entries of any of the given tags. Terms are
+    matched as whole words ignoring case and punctuation, so '#457' matches '(#457)'."""
+
+    __slots__ = '_entries', '_postings'
+
+    def __init__(self):
+        # (version, tag, position, text) of each entry, in the order of the change log
+        self._entries = []
+        # token -> {entry id: [positions of the token in the entry]}
+        self._postings = {}
+
+    @classmethod
+    def fromChangelog(cls, changelog) -> 'SearchIndex':
+        """Index the entries of every version of a Changelog."""
+
+        index = cls()
+        for version in dict.fromkeys(changelog.versions):
+            index.add(version, changelog[version])
+
+        return index
+
+    def add(self, version: SemanticVersion, changes):
+        """Index the entries of a version's Changes."""
+
+        for tag in TAGS:
+            for position, entry in enumerate(changes.entries(tag)):
+                entryId = len(self._entries)
+                self._entries.append((version, tag, position, entry))
+                for i, token in enumerate(tokenize(entry)):
+                    self._postings.setdefault(token, {}).setdefault(entryId, []).append(i)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _matchPhrase(self, tokens: list[str]) -> set[int]:
+        postings = [self._postings.get(token) for token in tokens]
+        if not all(postings):
+            return set()
+
+        candidates = set.intersection(*(set(p) for p in postings))
+        if len(tokens) == 1:
+            return candidates
+
+        matched = set()
+        for entryId in candidates:
+            following = [set(p[entryId]) for p in postings[1:]]
+            if any(all(start + i in positions for i, positions in enumerate(following, 1))
+                   for start in postings[0][entryId]):
+                matched.add(entryId)
+
+        return matched
+
+    def search(self, query: str, tags: list[str] | None = None, limit: int | None = None) -> list[SearchHit]:
+        """Return the entries matching the query, in the order of the change log. Tags given here are combined with
+        any tag: filters in the query."""
+
+        tagFilter = set(t.lower() for t in tags or ())
+        phrases = []
+        for match in QUERY_PART.finditer(query):
+            if match['tag'] is not None:
+                tagFilter.add(match['tag'].lower())
+            else:
+                tokens = tokenize(match['phrase'] if match['phrase'] is not None else match['term'])
+                if tokens:
+                    phrases.append(tokens)
+
+        unknown = tagFilter.difference(TAGS)
+        if unknown:
+            raise ValueError(f'unknown change tags: {", ".join(sorted(unknown))}')
+        if not phrases and not tagFilter:
+            raise ValueError('empty search query')
+
+        if phrases:
+            # Start with the rarest token so the candidate set is small.
+            phrases.sort(key=lambda p: min(len(self._postings.get(t, ())) for t in p))
+            matched = self._matchPhrase(phrases[0])
+            for tokens in phrases[1:]:
+                if not matched:
+                    break
+                matched &= self._matchPhrase(tokens)
+        else:
+            matched = range(len(self._entries))
+
+        hits = []
+        for entryId in sorted(matched):
+            version, tag, position, entry = self._entries[entryId]
+            if tagFilter and tag not in tagFilter:
+                continue
+            hits.append(SearchHit(version, tag, position, entry))
+            if limit is not None and len(hits) >= limit:
+                break
+
+        return hits
+
+    def toDict(self) -> dict:
+        """Return the index in a form that can be serialized as JSON."""
+
+        return {'format': _FORMAT,
+                'entries': [[str(version), tag, position, entry] for version, tag, position, entry in self._entries],
+                'postings': {token: [[entryId, positions] for entryId, positions in postings.items()]
+                             for token, postings in self._postings.items()}}
+
+    @classmethod
+    def fromDict(cls, data: dict) -> 'SearchIndex':
+        """Create an index from the dict returned by toDict."""
+
+        if not isinstance(data, dict) or data.get('format') != _FORMAT:
+            raise ValueError('unsupported search index format')
+
+        index = cls()
+        index._entries = [(SemanticVersion(version), tag, position, entry)
+                          for version, tag, position, entry in data['entries']]
+        index._postings = {token: {entryId: positions for entryId, positions in postings}
+                           for token, postings in data['postings'].items()}
+
+        return index
+
+    def save(self, path):
+        """Write the index to a JSON file."""
+
+        with open(path, 'w') as f:
+            json.dump(self.toDict(), f)
+
+    @classmethod
+    def load(cls, path) -> 'SearchIndex':
+        """Read an index written by save."""
+
+        with open(path, 'r') as f:
+            return cls.fromDict(json.load(f))
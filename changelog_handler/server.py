@@ -0,0 +1,219 @@
+import json
+import os
+import socket
+import socketserver
+import threading
+
+from ._defaults import DEFAULT_SOCKET_PATH
+from .changelog import Changelog
+
+__all__ = ['ChangelogServer', 'ChangelogClient', 'ServerError', 'DEFAULT_SOCKET_PATH']
+
+
+class ServerError(Exception):
+    def __init__(self, *args):
+        super().__init__(*args)
+
+
+def _requireUnixSockets():
+    if not hasattr(socket, 'AF_UNIX') or not hasattr(socketserver, 'ThreadingUnixStreamServer'):
+        raise OSError('Unix sockets are not supported on this platform')
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Answers each JSON line read from a connection with a JSON line, until the client disconnects."""
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError('a request must be a JSON object')
+            except ValueError as e:
+                response = {'error': f'invalid request: {e}'}
+            else:
+                response = self.server.changelogServer.handle(request)
+            self.wfile.write(json.dumps(response).encode() + b'\n')
+
+
+class ChangelogServer:
+    """Keeps parsed change logs in memory and answers queries about them over a Unix socket, so repeated queries
+    don't pay for starting a process and parsing the file each time.
+
+    Each request is a JSON object on a single line with an 'op' and the 'path' of a change log, and each response is
+    a JSON line with either a 'result' or an 'error'. The ops are:
+
+    - get: the version, link and changes of 'version', in the same form as Changelog.getVersion
+    - list: every version, in the order of the file
+    - range: the result of get for every version between 'low' and 'high' by precedence, keyed by version and
+      newest first. Either bound can be null, and 'inclusive' defaults to true
+    - links: the link of each version
+    - all: the result of get for every version, keyed by version in the order of the file
+
+    A change log is parsed the first time it's requested and refreshed whenever its size or modification time
+    changes. At most maxLogs change logs are kept, after that the least recently used is dropped."""
+
+    __slots__ = '_socketPath', '_maxLogs', '_logs', '_lock', '_server'
+
+    def __init__(self, socketPath: str | os.PathLike = DEFAULT_SOCKET_PATH, maxLogs: int = 64):
+        if maxLogs < 1:
+            raise ValueError('maxLogs must be a positive integer')
+
+        self._socketPath = os.fspath(socketPath)
+        self._maxLogs = maxLogs
+        self._logs = {}
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def socketPath(self) -> str:
+        return self._socketPath
+
+    def _changelog(self, path: str) -> Changelog:
+        path = os.path.realpath(path)
+        stat = os.stat(path)
+        signature = stat.st_size, stat.st_mtime_ns
+
+        # Entries are reinserted on every use so the first one is always the least recently used.
+        entry = self._logs.pop(path, None)
+        if entry is None:
+            log = Changelog(path, lazy=True)
+        else:
+            log, previous = entry
+            if previous != signature:
+                log.refresh()
+        self._logs[path] = log, signature
+
+        while len(self._logs) > self._maxLogs:
+            del self._logs[next(iter(self._logs))]
+
+        return log
+
+    @staticmethod
+    def _get(log: Changelog, request: dict):
+        return log.getVersion(request['version'])
+
+    @staticmethod
+    def _list(log: Changelog, request: dict):
+        return [str(v) for v in log.versions]
+
+    @staticmethod
+    def _range(log: Changelog, request: dict):
+        versions = log.between(request.get('low'), request.get('high'), request.get('inclusive', True))
+        return {str(v): log.getVersion(v) for v in versions}
+
+    @staticmethod
+    def _links(log: Changelog, request: dict):
+        return {str(v): url for v, url in log.links.items()}
+
+    @staticmethod
+    def _all(log: Changelog, request: dict):
+        return {str(v): log.getVersion(v) for v in log.versions}
+
+    _OPS = {'get': _get, 'list': _list, 'range': _range, 'links': _links, 'all': _all}
+
+    def handle(self, request: dict) -> dict:
+        """Answer a single request, returning the response. Errors are reported in the response rather than
+        raised."""
+
+        try:
+            op = self._OPS.get(request.get('op'))
+            if op is None:
+                raise ServerError(f'unknown op: {request.get("op")!r}')
+            if not isinstance(request.get('path'), str):
+                raise ServerError('path must be a string')
+
+            with self._lock:
+                return {'result': op(self._changelog(request['path']), request)}
+        except Exception as e:
+            return {'error': f'{type(e).__name__}: {e}'}
+
+    def listen(self) -> 'ChangelogServer':
+        """Bind the socket, replacing it if it was left behind by a server that is no longer running."""
+
+        _requireUnixSockets()
+        if os.path.exists(self._socketPath):
+            try:
+                ChangelogClient(self._socketPath).close()
+            except OSError:
+                os.remove(self._socketPath)
+            else:
+                raise OSError(f'a server is already listening on {self._socketPath}')
+
+        # Only the user running the server can query it. The socket is created with these permissions rather than
+        # changed after binding, so there's no moment when anyone else can connect.
+        umask = os.umask(0o177)
+        try:
+            server = socketserver.ThreadingUnixStreamServer(self._socketPath, _RequestHandler)
+        finally:
+            os.umask(umask)
+        server.daemon_threads = True
+        server.changelogServer = self
+        self._server = server
+
+        return self
+
+    def serveForever(self):
+        """Answer requests until shutdown() is called, then remove the socket."""
+
+        if self._server is None:
+            self.listen()
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            self._server = None
+            try:
+                os.remove(self._socketPath)
+            except OSError:
+                pass
+
+    def shutdown(self):
+        """Stop serveForever() from another thread and wait for it to finish."""
+
+        if self._server is not None:
+            self._server.shutdown()
+
+
+class ChangelogClient:
+    """A connection to a ChangelogServer. Requests are sent one at a time over the same connection."""
+
+    __slots__ = '_socket', '_file'
+
+    def __init__(self, socketPath: str | os.PathLike = DEFAULT_SOCKET_PATH, timeout: float | None = 5.0):
+        _requireUnixSockets()
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self._socket.settimeout(timeout)
+            self._socket.connect(os.fspath(socketPath))
+        except OSError:
+            self._socket.close()
+            raise
+        self._file = self._socket.makefile('rwb')
+
+    def request(self, op: str, path: str | os.PathLike, **params):
+        """Send a request about the change log at path and return its result. Raises a ServerError if the server
+        couldn't answer it."""
+
+        message = dict(params, op=op, path=os.path.abspath(path))
+        self._file.write(json.dumps(message).encode() + b'\n')
+        self._file.flush()
+
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError('the server closed the connection')
+        response = json.loads(line)
+        if 'error' in response:
+            raise ServerError(response['error'])
+
+        return response['result']
+
+    def close(self):
+        self._file.close()
+        self._socket.close()
+
+    def __enter__(self) -> 'ChangelogClient':
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
@@ -0,0 +1,248 @@
+import operator
+from array import array
+from itertools import compress, groupby
+
+from ._pattern import SEMVAR, SEMVAR_LINES
+from .version import SemanticVersion, InvalidSemanticVersion, Unreleased, _checkPreRelease, _precedenceKey
+
+__all__ = ['VersionTable']
+
+
+def _parse(version: str) -> tuple[int, int, int, str, str]:
+    match = SEMVAR.fullmatch(version)
+    if match is None:
+        raise InvalidSemanticVersion(f'{version!r} is not a valid semantic version')
+
+    return _components(match)
+
+
+def _components(match) -> tuple[int, int, int, str, str]:
+    major, minor, patch, preRelease, build = match.group('major', 'minor', 'patch', 'pre_release', 'build')
+    preRelease = preRelease or ''
+    _checkPreRelease(preRelease)
+
+    return int(major), int(minor), int(patch), preRelease, build or ''
+
+
+class VersionTable:
+    """A compact, list-like container of semantic versions. Major, minor and patch numbers are stored in unsigned
+    64-bit array columns, and pre-release and build strings as indexes into a pool that holds each distinct string
+    once, so a version takes 32 bytes rather than a SemanticVersion object and its strings.
+
+    SemanticVersion objects are only created when versions are read from the table. Filtering works on whole
+    columns at once, and sorting compares each distinct pre-release string by a precedence rank computed once for
+    the pool. Unreleased can't be stored in a table."""
+
+    __slots__ = '_major', '_minor', '_patch', '_preRelease', '_build', '_strings', '_indexes', '_ranks'
+
+    def __init__(self, versions=()):
+        """Create a table of an iterable of SemanticVersion objects or version strings."""
+
+        self._major = array('Q')
+        self._minor = array('Q')
+        self._patch = array('Q')
+        self._preRelease = array('I')
+        self._build = array('I')
+        # The pool of pre-release and build strings, index 0 is the empty string.
+        self._strings = ['']
+        self._indexes = {'': 0}
+        # Precedence rank of each string in the pool as a pre-release, computed when first sorting.
+        self._ranks = array('I')
+
+        self.extend(versions)
+
+    @classmethod
+    def fromStrings(cls, strings, errors: str = 'raise') -> 'VersionTable | tuple[VersionTable, list[str]]':
+        """Create a table of version strings in one pass, without creating SemanticVersion objects. The errors
+        argument is handled the same as SemanticVersion.parseMany."""
+
+        SemanticVersion._checkErrors(errors)
+        strings = list(strings)
+        for string in strings:
+            if not isinstance(string, str):
+                raise TypeError('strings must only contain str types')
+
+        table, invalid = cls(), []
+        text = '\n'.join(s if '\n' not in s else '\0' for s in strings)
+        seen = {}
+        for string, match in zip(strings, SEMVAR_LINES.finditer(text)):
+            row = seen.get(string)
+            if row is None:
+                if match['version'] is not None:
+                    try:
+                        row = seen[string] = table._internRow(*_components(match))
+                    except InvalidSemanticVersion:
+                        pass
+                if row is None:
+                    if errors == 'raise':
+                        raise InvalidSemanticVersion(f'{string!r} is not a valid semantic version')
+                    invalid.append(string)
+                    continue
+            table._appendRow(row)
+
+        return (table, invalid) if errors == 'collect' else table
+
+    def _intern(self, string: str) -> int:
+        index = self._indexes.get(string)
+        if index is None:
+            index = self._indexes[string] = len(self._strings)
+            self._strings.append(string)
+        return index
+
+    def _internRow(self, major: int, minor: int, patch: int, preRelease: str, build: str) -> tuple:
+        """Return a row of the table for the components of a version, adding its strings to the pool."""
+
+        if (major | minor | patch) >> 64:
+            raise OverflowError('version numbers in a VersionTable are limited to 64 bits')
+        return major, minor, patch, self._intern(preRelease), self._intern(build)
+
+    def _appendRow(self, row: tuple):
+        major, minor, patch, preRelease, build = row
+        self._major.append(major)
+        self._minor.append(minor)
+        self._patch.append(patch)
+        self._preRelease.append(preRelease)
+        self._build.append(build)
+
+    @staticmethod
+    def _row(version: str | SemanticVersion) -> tuple[int, int, int, str, str]:
+        if isinstance(version, str):
+            return _parse(version)
+        if version is Unreleased:
+            raise ValueError('Unreleased cannot be stored in a VersionTable')
+        if isinstance(version, SemanticVersion):
+            return version.major, version.minor, version.patch, version.preRelease, version.buildMetadata
+
+        raise TypeError('version must be a str or SemanticVersion type')
+
+    def append(self, version: str | SemanticVersion):
+        self._appendRow(self._internRow(*self._row(version)))
+
+    def extend(self, versions):
+        for version in versions:
+            self.append(version)
+
+    def _take(self, indexes) -> 'VersionTable':
+        """Return a table of the rows at indexes, sharing this table's string pool."""
+
+        indexes = list(indexes)
+        table = self.__class__.__new__(self.__class__)
+        for name in ('_major', '_minor', '_patch', '_preRelease', '_build'):
+            column = getattr(self, name)
+            setattr(table, name, array(column.typecode, [column[i] for i in indexes]))
+        # The pool only ever grows, so it can be shared.
+        table._strings = self._strings
+        table._indexes = self._indexes
+        table._ranks = self._ranks
+
+        return table
+
+    def _string(self, i: int) -> str:
+        string = f'{self._major[i]}.{self._minor[i]}.{self._patch[i]}'
+        if self._preRelease[i]:
+            string += f'-{self._strings[self._preRelease[i]]}'
+        if self._build[i]:
+            string += f'+{self._strings[self._build[i]]}'
+
+        return string
+
+    def __len__(self) -> int:
+        return len(self._major)
+
+    def __getitem__(self, item: int | slice) -> 'SemanticVersion | VersionTable':
+        if isinstance(item, slice):
+            return self._take(range(*item.indices(len(self))))
+
+        return SemanticVersion(self._string(range(len(self))[item]))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield SemanticVersion(self._string(i))
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.strings()!r})'
+
+    def strings(self) -> list[str]:
+        """The version strings of the table, in order."""
+        return [self._string(i) for i in range(len(self))]
+
+    def toList(self) -> list[SemanticVersion]:
+        return SemanticVersion.parseMany(self.strings())
+
+    def __contains__(self, item: str | SemanticVersion) -> bool:
+        """Whether the table holds a version equal to item. Build metadata is ignored, the same as comparing
+        SemanticVersion objects."""
+
+        try:
+            major, minor, patch, preRelease, _ = self._row(item)
+        except (InvalidSemanticVersion, ValueError):
+            return False
+        preRelease = self._indexes.get(preRelease)
+        if preRelease is None:
+            return False
+
+        # array.index scans the major column in C, only its matches are looked at here.
+        column, stop = self._major, len(self)
+        i = 0
+        while True:
+            try:
+                i = column.index(major, i, stop)
+            except ValueError:
+                return False
+            if self._minor[i] == minor and self._patch[i] == patch and self._preRelease[i] == preRelease:
+                return True
+            i += 1
+
+    def _mask(self, major: int | None, minor: int | None, patch: int | None, preRelease: bool | str | None):
+        """Return an iterable of whether each row matches the components that aren't None."""
+
+        masks = [map(value.__eq__, column) for column, value in
+                 ((self._major, major), (self._minor, minor), (self._patch, patch)) if value is not None]
+        if preRelease is True:
+            masks.append(map(bool, self._preRelease))
+        elif preRelease is False:
+            masks.append(map(operator.not_, self._preRelease))
+        elif preRelease is not None:
+            masks.append(map(self._indexes.get(preRelease, -1).__eq__, self._preRelease))
+
+        if not masks:
+            return None
+        return masks[0] if len(masks) == 1 else map(all, zip(*masks))
+
+    def filter(self, major: int | None = None, minor: int | None = None, patch: int | None = None,
+               preRelease: bool | str | None = None) -> 'VersionTable':
+        """Return a table of the versions whose components equal the given ones. preRelease can also be True for
+        only pre-releases or False for only releases."""
+
+        mask = self._mask(major, minor, patch, preRelease)
+        return self._take(range(len(self)) if mask is None else compress(range(len(self)), mask))
+
+    def _rankColumn(self) -> array:
+        """Return the precedence rank of each row's pre-release, ranking the pool first if it has grown."""
+
+        strings = self._strings
+        if len(self._ranks) != len(strings):
+            def key(i):
+                return _precedenceKey(0, 0, 0, strings[i])[3]
+
+            ranks = array('I', bytes(4 * len(strings)))
+            # Strings of equal precedence, such as the build strings '1' and '01', share a rank.
+            for rank, (_, group) in enumerate(groupby(sorted(range(len(strings)), key=key), key=key)):
+                for i in group:
+                    ranks[i] = rank
+            self._ranks = ranks
+
+        return array('I', map(self._ranks.__getitem__, self._preRelease))
+
+    def sort(self, reverse: bool = False):
+        """Sort the table in place by precedence. Versions of equal precedence keep their order."""
+
+        # A stable sort by each column in turn, least significant first. The keys are looked up in C, so no
+        # SemanticVersion, tuple or Python key function is involved per version.
+        order = list(range(len(self)))
+        for column in (self._rankColumn(), self._patch, self._minor, self._major):
+            order.sort(key=column.__getitem__, reverse=reverse)
+
+        sortedTable = self._take(order)
+        for name in ('_major', '_minor', '_patch', '_preRelease', '_build'):
+            setattr(self, name, getattr(sortedTable, name))
@@ -1,44 +1,185 @@
 import re
-from functools import total_ordering
-from changelog_handler._pattern import SEMVAR
+import math
+from collections import OrderedDict, namedtuple
+from changelog_handler._pattern import SEMVAR, SEMVAR_LINES, SEMVAR_SEARCH
+from changelog_handler._timing import timed
 
 __all__ = ['SemanticVersion', 'InvalidSemanticVersion', 'Unreleased']
 
 
+# Precedence key of Unreleased, which sorts after every released version.
+UNRELEASED_KEY = (math.inf,)
+
+# Default number of distinct version strings whose parsed instances are kept for reuse.
+DEFAULT_CACHE_SIZE = 4096
+
+
 class InvalidSemanticVersion(Exception):
     def __init__(self, *args):
         super().__init__(*args)
 
 
-@total_ordering
 class SemanticVersion:
-    __slots__ = '_major', '_minor', '_patch', '_preRelease', '_build'
+    __slots__ = '_major', '_minor', '_patch', '_preRelease', '_build', '_key'
 
+    @timed('version', lambda args, result: len(args[1]))
     def __new__(cls, version: str):
         if not isinstance(version, str):
             raise TypeError('version must be a str type')
 
+        # Parsed instances are interned, so repeated version strings share one immutable instance. This is the
+        # hottest path of parsing, so a hit is handled inline rather than through _InternTable.get, and
+        # SemanticVersion itself is keyed by the string alone rather than a tuple that has to be hashed.
+        key = version if cls is SemanticVersion else (cls, version)
+        table = _interned
+        entries = table.entries
+        try:
+            self = entries[key]
+            entries.move_to_end(key)
+        except KeyError:
+            return table.add(key, cls._parse(version))
+        table.hits += 1
+        return self
+
+    @classmethod
+    def _parse(cls, version: str) -> 'SemanticVersion':
         if re.fullmatch('unreleased', version, re.IGNORECASE):
             return Unreleased
 
-        self = object.__new__(cls)
-
         match = SEMVAR.fullmatch(version)
         if match is None:
             raise InvalidSemanticVersion('version string does not contain a valid sematic version')
 
-        results = match.groupdict(default='')
-        self._major = int(results['major'])
-        self._minor = int(results['minor'])
-        self._patch = int(results['patch'])
-        self._preRelease = results['pre_release']
-        self._build = results['build']
-        for p in self._preRelease.split('.'):
-            if p and p != '0' and p[0] == '0':
-                raise InvalidSemanticVersion('pre-release dot separated identifiers must not include leading zeros')
+        return cls._fromMatch(match)
+
+    @classmethod
+    def _fromMatch(cls, match: re.Match) -> 'SemanticVersion':
+        """Build an instance from a match of a pattern containing SEMVAR_RAW."""
+
+        major, minor, patch, preRelease, build = match.group('major', 'minor', 'patch', 'pre_release', 'build')
+        preRelease = preRelease or ''
+        _checkPreRelease(preRelease)
+
+        self = object.__new__(cls)
+        setattr_ = object.__setattr__
+        setattr_(self, '_major', int(major))
+        setattr_(self, '_minor', int(minor))
+        setattr_(self, '_patch', int(patch))
+        setattr_(self, '_preRelease', preRelease)
+        setattr_(self, '_build', build or '')
+        setattr_(self, '_key', _precedenceKey(self._major, self._minor, self._patch, preRelease))
 
         return self
 
+    @staticmethod
+    def _checkErrors(errors: str):
+        if errors not in ('raise', 'skip', 'collect'):
+            raise ValueError("errors must be one of 'raise', 'skip' or 'collect'")
+
+    @classmethod
+    def parseMany(cls, versions, errors: str = 'raise') -> 'list[SemanticVersion] | tuple[list, list]':
+        """Parse an iterable of version strings in one pass. If errors is 'raise' an invalid string raises
+        InvalidSemanticVersion, if it is 'skip' invalid strings are left out, and if it is 'collect' a tuple of the
+        parsed versions and the list of invalid strings is returned."""
+
+        cls._checkErrors(errors)
+        versions = list(versions)
+        for version in versions:
+            if not isinstance(version, str):
+                raise TypeError('versions must only contain str types')
+
+        parsed, invalid = [], []
+        if not versions:
+            return (parsed, invalid) if errors == 'collect' else parsed
+
+        # Strings spanning lines can't be valid versions, so they're replaced with a line that can't match either.
+        text = '\n'.join(v if '\n' not in v else '\0' for v in versions)
+        seen = {}
+        for string, match in zip(versions, SEMVAR_LINES.finditer(text)):
+            version = seen.get(string)
+            if version is None:
+                if match['unreleased']:
+                    version = Unreleased
+                elif match['invalid'] is None:
+                    # Valid strings go through the interning cache, so equal versions are the same instance. A miss
+                    # is built from the match rather than parsing the string again.
+                    key = string if cls is SemanticVersion else (cls, string)
+                    version = _interned.get(key)
+                    if version is None:
+                        try:
+                            version = _interned.add(key, cls._fromMatch(match))
+                        except InvalidSemanticVersion:
+                            pass
+                if version is None:
+                    if errors == 'raise':
+                        raise InvalidSemanticVersion(f'{string!r} is not a valid semantic version')
+                    invalid.append(string)
+                    continue
+                seen[string] = version
+            parsed.append(version)
+
+        return (parsed, invalid) if errors == 'collect' else parsed
+
+    @classmethod
+    def findAll(cls, text: str, errors: str = 'raise') -> 'list[SemanticVersion] | tuple[list, list]':
+        """Return every semantic version found in text, in order of appearance, e.g. from git tag lists, lock files
+        or change log headings. The errors argument is handled the same as parseMany."""
+
+        cls._checkErrors(errors)
+        if not isinstance(text, str):
+            raise TypeError('text must be a str type')
+
+        found, invalid = [], []
+        seen = {}
+        for match in SEMVAR_SEARCH.finditer(text):
+            string = match[0]
+            version = seen.get(string)
+            if version is None:
+                key = string if cls is SemanticVersion else (cls, string)
+                try:
+                    version = _interned.get(key)
+                    if version is None:
+                        version = _interned.add(key, cls._fromMatch(match))
+                    seen[string] = version
+                except InvalidSemanticVersion:
+                    if errors == 'raise':
+                        raise
+                    invalid.append(string)
+                    continue
+            found.append(version)
+
+        return (found, invalid) if errors == 'collect' else found
+
+    @staticmethod
+    def cacheInfo():
+        """Return the hits, misses, maximum size and current size of the interning cache."""
+        return _interned.info()
+
+    @staticmethod
+    def clearCache():
+        _interned.clear()
+
+    @staticmethod
+    def setCacheSize(maxsize: int):
+        """Replace the interning cache with an empty one holding up to maxsize version strings."""
+
+        global _interned
+        if not isinstance(maxsize, int) or maxsize < 0:
+            raise ValueError('maxsize must be a non-negative integer')
+        _interned = _InternTable(maxsize)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{self.__class__.__name__} objects are immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{self.__class__.__name__} objects are immutable')
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
     def __str__(self) -> str:
         rtn = f'{self._major}.{self._minor}.{self._patch}'
         if self._preRelease:
@@ -52,7 +193,8 @@ class SemanticVersion:
         return f'{self.__class__.__name__}("{self.__str__()}")'
 
     def __hash__(self):
-        return hash((self._major, self._minor, self._patch, self._preRelease, self._build))
+        # Build metadata doesn't take part in equality, so it mustn't take part in the hash either.
+        return hash((self._major, self._minor, self._patch, self._preRelease))
 
     def __reduce__(self):
         return self.__class__, (self.__str__(),)
@@ -88,81 +230,44 @@ class SemanticVersion:
 
         return NotImplemented
 
-    def _compareVersion(self, rhs: 'SemanticVersion') -> int:
-        """Compare self to rhs with version numbering only. Returns -1 if self < rhs, 1 if self > rhs, 0 if they are
-        equal."""
+    @property
+    def precedence(self) -> tuple:
+        """A tuple whose ordering matches the precedence of semantic versions."""
+        return self._key
+
+    @staticmethod
+    def sortKey(version: 'str | SemanticVersion') -> tuple:
+        """Key function for sorting semantic versions, or version strings, by precedence, e.g.
+        sorted(versions, key=SemanticVersion.sortKey)."""
 
-        if self._major < rhs._major:
-            return -1
-        elif self._major > rhs._major:
-            return 1
+        if isinstance(version, str):
+            version = SemanticVersion(version)
+        if not isinstance(version, SemanticVersion):
+            raise TypeError('version must be a str or SemanticVersion type')
 
-        if self._minor < rhs._minor:
-            return -1
-        elif self._minor > rhs._minor:
-            return 1
+        return version._key
 
-        if self._patch < rhs._patch:
-            return -1
-        elif self._patch > rhs._patch:
-            return 1
+    def __lt__(self, other: 'SemanticVersion') -> bool:
+        if isinstance(other, SemanticVersion):
+            return self._key < other._key
 
-        return 0
+        return NotImplemented
 
-    @staticmethod
-    def _compareToInt(lhs, rhs):
-        if lhs < rhs:
-            return -1
-        elif lhs > rhs:
-            return 1
-        return 0
+    def __le__(self, other: 'SemanticVersion') -> bool:
+        if isinstance(other, SemanticVersion):
+            return self._key <= other._key
 
-    @staticmethod
-    def _compareIdentifiers(rId: str, lId: str):
-        if rId.isdigit():
-            rId = int(rId)
-            if lId.isdigit():
-                lId = int(lId)
-                return SemanticVersion._compareToInt(rId, lId)
-            else:
-                return -1
-        elif lId.isdigit():
-            return 1
-        return SemanticVersion._compareToInt(rId, lId)
-
-    def _comparePreRelease(self, rhs: 'SemanticVersion') -> int:
-        if self._preRelease and not rhs._preRelease:
-            return -1
-        elif not self._preRelease and rhs._preRelease:
-            return 1
-        elif self._preRelease == rhs._preRelease:
-            return 0
-
-        rhsIdentifiers = self._preRelease.split('.')
-        lhsIdentifiers = rhs._preRelease.split('.')
-
-        for rId, lId in zip(rhsIdentifiers, lhsIdentifiers):
-            result = self._compareIdentifiers(rId, lId)
-            if result != 0:
-                return result
-
-        if len(rhsIdentifiers) < len(lhsIdentifiers):
-            return -1
-        elif len(rhsIdentifiers) > len(lhsIdentifiers):
-            return 0
+        return NotImplemented
 
-    def __lt__(self, other: 'SemanticVersion') -> bool:
+    def __gt__(self, other: 'SemanticVersion') -> bool:
         if isinstance(other, SemanticVersion):
-            cmpVersion = self._compareVersion(other)
-            if cmpVersion == -1:
-                return True
-            elif cmpVersion == 1:
-                return False
-
-            cmpPre = self._comparePreRelease(other)
-            if cmpPre == -1:
-                return True
-            return False
+            return self._key > other._key
+
+        return NotImplemented
+
+    def __ge__(self, other: 'SemanticVersion') -> bool:
+        if isinstance(other, SemanticVersion):
+            return self._key >= other._key
 
         return NotImplemented
 
@@ -178,6 +283,7 @@ class UnreleasedType(SemanticVersion):
     def __new__(cls):
         if cls._instance is None:
             cls._instance = object.__new__(cls)
+            object.__setattr__(cls._instance, '_key', UNRELEASED_KEY)
         return cls._instance
 
     def __str__(self):
@@ -186,6 +292,10 @@ class UnreleasedType(SemanticVersion):
     def __repr__(self):
         return 'Unreleased'
 
+    def __reduce__(self):
+        # Pickle by reference to the module level singleton.
+        return 'Unreleased'
+
     def __hash__(self):
         return hash('unreleased')
 
@@ -197,16 +307,81 @@ class UnreleasedType(SemanticVersion):
 
         return NotImplemented
 
-    def __lt__(self, other: SemanticVersion):
-        if type(other) == SemanticVersion:
-            return False
-        elif other is Unreleased:
-            return False
-
-        return NotImplemented
-
     def toDict(self) -> dict:
         return {}
 
 
+def _checkPreRelease(preRelease: str):
+    for p in preRelease.split('.'):
+        if p and p != '0' and p[0] == '0':
+            raise InvalidSemanticVersion('pre-release dot separated identifiers must not include leading zeros')
+
+
+def _precedenceKey(major: int, minor: int, patch: int, preRelease: str) -> tuple:
+    """Build a tuple that orders the same as SemVer 2.0 precedence. A release sorts after all of its pre-releases,
+    numeric pre-release identifiers are compared numerically and sort before alphanumeric ones, and a shorter set of
+    identifiers sorts before a longer one with the same prefix."""
+
+    if not preRelease:
+        return major, minor, patch, (1,)
+
+    identifiers = tuple((0, int(i)) if i.isdigit() else (1, i) for i in preRelease.split('.'))
+    return major, minor, patch, (0, identifiers)
+
+
+_CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class _InternTable:
+    """The interning cache. entries maps version strings, or (class, version string) for subclasses, to the parsed
+    instance, least recently used first, and the least recently used is evicted once it holds maxsize. Unlike
+    functools.lru_cache, instances built elsewhere can be added to it, so parseMany and findAll don't parse a string
+    again when they already have its match."""
+
+    __slots__ = 'entries', 'maxsize', 'hits', 'misses'
+
+    def __init__(self, maxsize: int):
+        self.entries = OrderedDict()
+        self.maxsize = maxsize
+        self.hits = self.misses = 0
+
+    def get(self, key: tuple) -> SemanticVersion | None:
+        """Return the instance for key, or None if it has to be built and added."""
+
+        try:
+            version = self.entries[key]
+            # The key may also have been evicted by another thread between the lookup and the move.
+            self.entries.move_to_end(key)
+        except KeyError:
+            return None
+
+        self.hits += 1
+        return version
+
+    def add(self, key: tuple, version: SemanticVersion) -> SemanticVersion:
+        """Count a miss for key and add its instance. Returns it, or the instance another thread added meanwhile."""
+
+        self.misses += 1
+        if not self.maxsize:
+            return version
+
+        entries = self.entries
+        version = entries.setdefault(key, version)
+        while len(entries) > self.maxsize:
+            try:
+                entries.popitem(last=False)
+            except KeyError:
+                break
+        return version
+
+    def info(self) -> _CacheInfo:
+        return _CacheInfo(self.hits, self.misses, self.maxsize, len(self.entries))
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.misses = 0
+
+
+_interned = _InternTable(DEFAULT_CACHE_SIZE)
+
 Unreleased = UnreleasedType()
@@ -5,6 +5,15 @@ from .patternTest import PatternTest
 from .changeTest import ChangeTest
 from .changelogTest import ChangelogTest
 from.commandTest import CommandTest
+from .cacheTest import CacheTest
+from .constraintTest import ConstraintTest
+from .scanTest import ScanTest
+from .asyncTest import AsyncTest
+from .serverTest import ServerTest
+from .profileTest import ProfileTest
+from .searchTest import SearchTest
+from .importTest import ImportTest
+from .tableTest import TableTest
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,83 @@
+import asyncio
+import concurrent.futures
+import pathlib
+import shutil
+import tempfile
+import unittest
+
+from changelog_handler import Changelog, ChangelogFormatException, agather
+
+
+class PendingExecutor(concurrent.futures.Executor):
+    """Never runs what is submitted to it, so loads stay in progress until they're cancelled."""
+
+    def __init__(self):
+        self.futures = []
+
+    def submit(self, fn, /, *args, **kwargs):
+        future = concurrent.futures.Future()
+        self.futures.append(future)
+        return future
+
+
+class AsyncTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tempDir = tempfile.TemporaryDirectory()
+        cls.root = pathlib.Path(cls.tempDir.name)
+        thisDir = pathlib.Path(__file__).parent
+        for name in ('a', 'b', 'b/c'):
+            (cls.root / name).mkdir(parents=True)
+        shutil.copy(thisDir / 'testlog.md', cls.root / 'a' / 'CHANGELOG.md')
+        shutil.copy(thisDir / 'inlinelog.md', cls.root / 'b' / 'c' / 'CHANGELOG.md')
+        (cls.root / 'b' / 'CHANGELOG.md').write_text('No versions here.\n')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tempDir.cleanup()
+
+    def testAload(self):
+        path = self.root / 'a' / 'CHANGELOG.md'
+        log = asyncio.run(Changelog.aload(path, lazy=True))
+        self.assertEqual(log.toDict(), Changelog(path).toDict())
+
+        with concurrent.futures.ProcessPoolExecutor(1) as executor:
+            log = asyncio.run(Changelog.aload(path, executor))
+        self.assertEqual(log.toDict(), Changelog(path).toDict())
+
+    def testAgather(self):
+        paths = [self.root / p / 'CHANGELOG.md' for p in ('a', 'b/c', 'a')]
+        logs = asyncio.run(agather(paths, limit=2, lazy=True))
+        self.assertEqual([len(log.versions) for log in logs], [len(Changelog(path).versions) for path in paths])
+
+        paths.insert(1, self.root / 'b' / 'CHANGELOG.md')
+        with self.assertRaises(ChangelogFormatException):
+            asyncio.run(agather(paths))
+        results = asyncio.run(agather(paths, returnExceptions=True))
+        self.assertIsInstance(results[1], ChangelogFormatException)
+        self.assertIsInstance(results[2], Changelog)
+
+        with self.assertRaises(ValueError):
+            asyncio.run(agather(paths, limit=0))
+
+    def testAgatherCancel(self):
+        executor = PendingExecutor()
+
+        async def cancel():
+            task = asyncio.ensure_future(agather([self.root / 'a' / 'CHANGELOG.md'] * 5, limit=2, executor=executor))
+            for _ in range(20):
+                await asyncio.sleep(0)
+            # Only as many loads as the limit are started.
+            self.assertEqual(len(executor.futures), 2)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancel())
+        self.assertEqual(len(executor.futures), 2)
+        self.assertTrue(all(future.cancelled() for future in executor.futures))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import os
+import pathlib
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from changelog_handler import Changelog, ParseCache
+
+
+class CacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.dir = pathlib.Path(self.tempDir.name)
+        self.logPath = self.dir / 'CHANGELOG.md'
+        shutil.copy(pathlib.Path(__file__).parent / 'testlog.md', self.logPath)
+        self.cachePath = self.dir / 'index.cache'
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def testRoundTrip(self):
+        answer = Changelog(self.logPath)
+
+        for memoryMap in (False, True):
+            with self.subTest(memoryMap=memoryMap):
+                first = Changelog(self.logPath, memoryMap=memoryMap, cache=self.cachePath)
+                self.assertTrue(self.cachePath.exists())
+
+                cache = ParseCache(self.cachePath)
+                with open(self.logPath, 'rb') as f:
+                    data = f.read()
+                kind = 'bytes' if memoryMap else 'text'
+                self.assertIsNotNone(cache.get(self.logPath, kind, data))
+
+                second = Changelog(self.logPath, memoryMap=memoryMap, cache=cache)
+                for log in (first, second):
+                    self.assertEqual(log.versions, answer.versions)
+                    self.assertEqual(log.links, answer.links)
+                    self.assertEqual(log.toDict(), answer.toDict())
+
+    def testInvalidation(self):
+        Changelog(self.logPath, cache=self.cachePath)
+
+        # Make sure a changed file is caught even if its size and modification time are unchanged.
+        stat = os.stat(self.logPath)
+        data = self.logPath.read_bytes().replace(b'## [0.0.8]', b'## [0.0.9]')
+        self.logPath.write_bytes(data)
+        os.utime(self.logPath, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        cache = ParseCache(self.cachePath)
+        self.assertIsNone(cache.get(self.logPath, 'text', data))
+
+        log = Changelog(self.logPath, cache=cache)
+        self.assertIn('0.0.9', log)
+        self.assertNotIn('0.0.8', log)
+        self.assertIsNotNone(cache.get(self.logPath, 'text', data))
+
+    def testMalformed(self):
+        answer = Changelog(self.logPath)
+        data = self.logPath.read_bytes()
+        index = answer._index()
+        malformed = [{}, [], {**index, 'versions': ['not a version']}, {**index, 'links': [['0.0.1']]},
+                     {**index, 'sections': [['0.0.1', 'a', 'b']]}, {**index, 'sections': [['0.0.1', 0, 10 ** 9]]}]
+
+        for i, entry in enumerate(malformed):
+            with self.subTest(i=i):
+                cache = ParseCache(self.cachePath)
+                cache.put(self.logPath, 'text', data, entry)
+
+                log = Changelog(self.logPath, cache=cache)
+                self.assertEqual(log.toDict(), answer.toDict())
+                self.assertEqual(cache.get(self.logPath, 'text', data), index)
+
+    def testThreads(self):
+        data = self.logPath.read_bytes()
+        index = Changelog(self.logPath)._index()
+        barrier = threading.Barrier(2)
+        replaced, realReplace = [], os.replace
+
+        def replace(source, destination):
+            # Both threads have written their temporary file before either is swapped in.
+            replaced.append(source)
+            barrier.wait(5)
+            realReplace(source, destination)
+
+        def write(kind):
+            ParseCache(self.cachePath).put(self.logPath, kind, data, index)
+
+        with mock.patch('changelog_handler.cache.os.replace', replace):
+            threads = [threading.Thread(target=write, args=(kind,)) for kind in ('text', 'bytes')]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(set(replaced)), 2)
+        self.assertEqual(len(ParseCache(self.cachePath)._load()), 1)
+        self.assertEqual(sorted(p.name for p in self.dir.iterdir()), ['CHANGELOG.md', 'index.cache'])
+
+    def testEviction(self):
+        cache = ParseCache(self.cachePath, maxEntries=2)
+        paths = []
+        for i in range(3):
+            path = self.dir / f'CHANGELOG{i}.md'
+            shutil.copy(self.logPath, path)
+            paths.append(path)
+            Changelog(path, cache=cache)
+
+        cache = ParseCache(self.cachePath, maxEntries=2)
+        with open(self.logPath, 'rb') as f:
+            data = f.read()
+        self.assertIsNone(cache.get(paths[0], 'text', data))
+        self.assertIsNotNone(cache.get(paths[2], 'text', data))
+
+        cache = ParseCache(self.cachePath, maxAge=-1)
+        self.assertIsNone(cache.get(paths[2], 'text', data))
+
+        cache.clear()
+        self.assertFalse(self.cachePath.exists())
@@ -157,3 +157,43 @@ class ChangeTest(unittest.TestCase):
 - fixed y2k issues
 
 '''}})
+
+    def testParsing(self):
+        change = Changes('### added\n- one\n\n### FIXED things\n- two\n')
+        self.assertEqual(change.added, {'tag_raw': '### added\n', 'content': '- one\n\n'})
+        self.assertEqual(change.fixed, {'tag_raw': '### FIXED things\n', 'content': '- two\n'})
+        self.assertEqual(Changes('').toDict(), {'added': {}, 'changed': {}, 'deprecated': {}, 'removed': {},
+                                                'fixed': {}, 'security': {}})
+
+        for string in ('- no heading\n', '## Added\n- wrong level\n', '### Added'):
+            with self.subTest(string=string), self.assertRaises(ValueError):
+                Changes(string)
+
+        # Large sections are parsed in linear time.
+        string = '### Added\n' + '- entry\n' * 100000 + '\n' * 100000
+        self.assertEqual(len(Changes(string).added['content']), len(string) - len('### Added\n'))
+
+    def testEntries(self):
+        change = Changes(self.string)
+        fixed = change.entries('fixed')
+        self.assertEqual(len(fixed), 14)
+        self.assertEqual(fixed[0], 'Improve French translation (#377).')
+        self.assertEqual(fixed[-1], 'Various broken links, page versions, and indentations.')
+        self.assertEqual(fixed[1:3], ['Improve id-ID translation (#416).', 'Improve Persian translation (#457).'])
+        self.assertEqual(list(fixed), fixed[:])
+        self.assertIs(change.entries('fixed'), fixed)
+        start, end = fixed.spans[0]
+        self.assertEqual(change.fixed['content'][start:end], fixed[0])
+        self.assertEqual(len(Changes('### Fixed\n- one\n').entries('deprecated')), 0)
+
+        tags = [tag for tag, _ in change.iterEntries()]
+        self.assertEqual(tags, sorted(tags, key=['added', 'changed', 'deprecated', 'removed', 'fixed',
+                                                 'security'].index))
+        self.assertEqual(len(tags), sum(len(change.entries(tag)) for tag in set(tags)))
+
+        change = Changes('### Added\n\n- one  \n* two\n  continued\n\n  more\n\nNot an entry.\n+ three\n-four\n')
+        self.assertEqual(list(change.entries('added')), ['one', 'two\n  continued\n\n  more', 'three'])
+        self.assertEqual(list(Changes.fromDict(change.toDict()).entries('added')), list(change.entries('added')))
+
+        with self.assertRaises(ValueError):
+            change.entries('unknown')
@@ -1,7 +1,11 @@
+import io
+import json
 import pathlib
+import tempfile
 import unittest
+from unittest import mock
 
-from changelog_handler import Changelog, SemanticVersion, Unreleased
+from changelog_handler import Changelog, ChangelogFormatException, SemanticVersion, Unreleased, extractChanges
 
 
 class ChangelogTest(unittest.TestCase):
@@ -325,6 +329,17 @@ class ChangelogTest(unittest.TestCase):
             with self.subTest(msg=answer):
                 self.assertIn(answer, self.log)
 
+    def testLookup(self):
+        self.assertIn('1.1.1+build.7', self.log)
+        self.assertNotIn('1.1.2', self.log)
+        self.assertEqual(repr(self.log['1.1.1+build.7']), repr(self.log['1.1.1']))
+        self.assertEqual(self.log.getVersion('v1.1.1')['link'], self.log.links[SemanticVersion('1.1.1')])
+
+        with self.assertRaises(ValueError):
+            self.log.getVersion('1.1.2')
+        with self.assertRaises(TypeError):
+            _ = 1 in self.log
+
     def testLinks(self):
         answers = {
             Unreleased: 'https://github.com/olivierlacan/keep-a-changelog/compare/v1.1.1...HEAD',
@@ -653,3 +668,308 @@ class ChangelogTest(unittest.TestCase):
                             'security': {}}}}
 
         self.assertEqual(self.log.toDict(), answer)
+
+    def testLazy(self):
+        thisDir = pathlib.Path(__file__).parent
+        log = Changelog(thisDir / 'testlog.md', lazy=True)
+
+        self.assertEqual(log.versions, self.log.versions)
+        self.assertEqual(log.links, self.log.links)
+        self.assertEqual(repr(log['0.0.7']), repr(self.log['0.0.7']))
+        self.assertIs(log['0.0.7'], log['0.0.7'])
+        self.assertEqual(list(log.changes), list(self.log.changes))
+        self.assertEqual(log.toDict(), self.log.toDict())
+
+        with self.assertRaises(KeyError):
+            _ = log['2.0.0']
+
+    def testExtractChanges(self):
+        thisDir = pathlib.Path(__file__).parent
+        for version in self.log.versions:
+            with self.subTest(msg=version):
+                changes, link = extractChanges(thisDir / 'testlog.md', version)
+                self.assertEqual(repr(changes), repr(self.log[version]))
+                self.assertEqual(link, '')
+
+        changes, link = extractChanges(thisDir / 'inlinelog.md', '1.1.0', link=True)
+        self.assertEqual(link, 'https://github.com/olivierlacan/keep-a-changelog/compare/v1.0.0...v1.1.0')
+        changes, link = extractChanges(thisDir / 'testlog.md', 'unreleased', link=True)
+        self.assertEqual(link, self.log.links[Unreleased])
+
+        with self.assertRaises(KeyError):
+            extractChanges(thisDir / 'testlog.md', '2.0.0')
+
+    def testMemoryMap(self):
+        thisDir = pathlib.Path(__file__).parent
+        for lazy in (False, True):
+            with self.subTest(lazy=lazy):
+                log = Changelog(thisDir / 'testlog.md', lazy=lazy, memoryMap=True)
+                self.assertEqual(log.versions, self.log.versions)
+                self.assertEqual(log.links, self.log.links)
+                self.assertEqual(log.toDict(), self.log.toDict())
+                log.close()
+
+        contents = (thisDir / 'testlog.md').read_text()
+        with tempfile.TemporaryDirectory() as tempDir:
+            path = pathlib.Path(tempDir) / 'CHANGELOG.md'
+            # Lines ending with '\r\n' or a lone '\r' are split the same as reading the file into memory does.
+            for newline in ('\r\n', '\r'):
+                with self.subTest(newline=newline):
+                    path.write_bytes(contents.replace('\n', newline).encode())
+                    with Changelog(path, memoryMap=True) as log:
+                        self.assertEqual(log.versions, self.log.versions)
+                        self.assertEqual(log.links, self.log.links)
+                        self.assertEqual(log.toDict(), Changelog(path).toDict())
+                    self.assertTrue(log._source._map.closed)
+                    # The file isn't held open once the change log is closed.
+                    path.unlink()
+
+    def testRanges(self):
+        versions = [SemanticVersion(v) for v in ('1.0.0', '0.3.0', '0.2.0')]
+        self.assertEqual(list(self.log.between('0.2.0', '1.0.0')), versions)
+        self.assertEqual(list(self.log.between('0.2.0', '1.0.0', inclusive=False)), versions[1:2])
+        self.assertEqual(list(self.log['0.2.0':'1.0.0']), versions[1:])
+        self.assertEqual(list(self.log[:'0.0.3']), [SemanticVersion('0.0.2'), SemanticVersion('0.0.1')])
+        self.assertEqual(list(self.log['1.1.0':]), [Unreleased, SemanticVersion('1.1.1'), SemanticVersion('1.1.0')])
+        self.assertEqual(list(self.log.between('0.2.1', '0.2.9')), [])
+        self.assertEqual(len(self.log[:]), len(self.log.versions))
+        self.assertIs(self.log['0.2.0':'1.0.0'][SemanticVersion('0.3.0')], self.log['0.3.0'])
+
+        with self.assertRaises(ValueError):
+            _ = self.log['0.2.0':'1.0.0':2]
+        with self.assertRaises(TypeError):
+            self.log.between(1, '1.0.0')
+
+        # Headings out of order in the file are still ranged by precedence.
+        with tempfile.TemporaryDirectory() as tempDir:
+            path = pathlib.Path(tempDir) / 'CHANGELOG.md'
+            path.write_text(''.join(f'## [{v}] - 2024-01-01\n\n' for v in ('1.0.0', '2.0.0-rc.1', '0.9.0', '2.0.0',
+                                                                          '1.5.0')))
+            log = Changelog(path)
+            self.assertEqual([str(v) for v in log.between('1.0.0', '2.0.0')], ['2.0.0', '2.0.0-rc.1', '1.5.0',
+                                                                                '1.0.0'])
+            self.assertEqual([str(v) for v in log['1.0.0':'2.0.0']], ['2.0.0-rc.1', '1.5.0', '1.0.0'])
+
+    def testRefresh(self):
+        head = '# Changelog\n\n## [Unreleased]\n\n### Added\n- Feature\n\n'
+        tail = ('## [1.0.0] - 2024-02-01\n\n### Fixed\n- Bug\n\n## [0.1.0] - 2024-01-01\n\n### Added\n- Start\n\n'
+                '[1.0.0]: https://example.com/1.0.0\n[0.1.0]: https://example.com/0.1.0\n')
+        with tempfile.TemporaryDirectory() as tempDir:
+            path = pathlib.Path(tempDir) / 'CHANGELOG.md'
+            path.write_text(head + tail)
+            for lazy in (False, True):
+                log = Changelog(path, lazy=lazy)
+                old = log['1.0.0'], log['0.1.0']
+                self.assertFalse(log.refresh())
+
+                path.write_text('# Changelog\n\n## [Unreleased]\n\n## [1.1.0] - 2024-03-01\n\n### Added\n- Feature\n- '
+                                'Other\n\n' + tail + '[1.1.0]: https://example.com/1.1.0\n')
+                self.assertTrue(log.refresh())
+                self.assertEqual([str(v) for v in log.versions], ['Unreleased', '1.1.0', '1.0.0', '0.1.0'])
+                self.assertEqual(log.links[SemanticVersion('1.1.0')], 'https://example.com/1.1.0')
+                self.assertEqual(log['Unreleased'].toDict()['added'], {})
+                self.assertEqual(log['1.1.0'].added['content'], '- Feature\n- Other')
+                self.assertIs(log['1.0.0'], old[0])
+                self.assertIs(log['0.1.0'], old[1])
+                self.assertEqual(list(log['1.0.0':]), [Unreleased, SemanticVersion('1.1.0'), SemanticVersion('1.0.0')])
+                self.assertEqual(log.toDict(), Changelog(path).toDict())
+
+                # A file that can no longer be parsed leaves the change log as it was.
+                path.write_text('# Changelog\n')
+                with self.assertRaises(ChangelogFormatException):
+                    log.refresh()
+                self.assertEqual(len(log.versions), 4)
+                path.write_text(head + tail)
+
+    def testRefreshMappedInPlace(self):
+        contents = ('# Changelog\n\n## [1.0.0] - 2024-02-01\n\n### Fixed\n- aaa\n\n'
+                    '## [0.1.0] - 2024-01-01\n\n### Added\n- Start\n')
+        with tempfile.TemporaryDirectory() as tempDir:
+            path = pathlib.Path(tempDir) / 'CHANGELOG.md'
+            for lazy in (False, True):
+                # Editors can save a file in place, which a memory mapped change log sees straight away.
+                path.write_text(contents)
+                with Changelog(path, lazy=lazy, memoryMap=True) as log:
+                    old = log['1.0.0'], log['0.1.0']
+                    self.assertFalse(log.refresh())
+                    with open(path, 'r+') as f:
+                        f.write(contents.replace('aaa', 'bbb'))
+                    self.assertTrue(log.refresh())
+                    self.assertEqual(log['1.0.0'].fixed['content'], '- bbb')
+                    self.assertIsNot(log['1.0.0'], old[0])
+                    self.assertIs(log['0.1.0'], old[1])
+                    self.assertFalse(log.refresh())
+
+                # A file that shrinks in place is never read past its new end through the old mapping.
+                path.write_text(contents + '\n' * 100_000 + '## [0.0.1] - 2023-01-01\n\n### Added\n- Old\n')
+                with Changelog(path, lazy=lazy, memoryMap=True) as log:
+                    with open(path, 'r+') as f:
+                        f.write(contents)
+                        f.truncate()
+                    self.assertTrue(log.refresh())
+                    self.assertEqual([str(v) for v in log.versions], ['1.0.0', '0.1.0'])
+                    self.assertEqual(log.toDict(), Changelog(path).toDict())
+
+    def testEditChangedFile(self):
+        contents = '# Changelog\n\n## [1.0.0] - 2024-02-01\n\n### Fixed\n- aaa\n'
+        with tempfile.TemporaryDirectory() as tempDir:
+            path = pathlib.Path(tempDir) / 'CHANGELOG.md'
+            for memoryMap in (False, True):
+                # A change log refreshed before an edit is written at the right place after an in-place save.
+                path.write_text(contents)
+                with Changelog(path, memoryMap=memoryMap) as log:
+                    with open(path, 'r+') as f:
+                        f.write(contents.replace('aaa', 'bbb'))
+                    log.addEntry('fixed', 'new', '1.0.0')
+                    self.assertEqual(path.read_text(), contents.replace('aaa', 'bbb\n- new'))
+
+                # If the file changes after the offsets were found, nothing is written.
+                path.write_text(contents)
+                with Changelog(path, memoryMap=memoryMap) as log, mock.patch.object(Changelog, 'refresh'):
+                    with open(path, 'r+') as f:
+                        f.write(contents.replace('aaa', 'bbb'))
+                    with self.assertRaises(OSError):
+                        log.addEntry('fixed', 'new', '1.0.0')
+                    self.assertEqual(path.read_text(), contents.replace('aaa', 'bbb'))
+
+    def testSnapshot(self):
+        with tempfile.TemporaryDirectory() as tempDir:
+            path = pathlib.Path(tempDir) / 'changelog.snapshot'
+            self.log.dump(path)
+            for lazy in (True, False):
+                log = Changelog.loadSnapshot(path, lazy=lazy)
+                self.assertEqual(log.versions, self.log.versions)
+                self.assertEqual(log.links, self.log.links)
+                self.assertEqual(log.toDict(), self.log.toDict())
+                self.assertEqual(log['0.3.0'].toDict(), self.log['0.3.0'].toDict())
+                self.assertEqual(list(log['0.2.0':'1.0.0']), list(self.log['0.2.0':'1.0.0']))
+            with self.assertRaises(TypeError):
+                log.refresh()
+            # Sections are rows of the snapshot, which can be indexed like offsets.
+            self.assertEqual(log._index()['versions'], self.log._index()['versions'])
+            self.assertEqual(log._index()['sections'][1], [str(log.versions[1]), 1, 2])
+
+            # Snapshots can be dumped again.
+            log.dump(path)
+            self.assertEqual(Changelog.loadSnapshot(path).toDict(), self.log.toDict())
+
+            data = path.read_bytes()
+            for invalid in (b'', b'not a snapshot at all', data[:40], b'XXXX' + data[4:]):
+                path.write_bytes(invalid)
+                with self.assertRaises(ChangelogFormatException):
+                    Changelog.loadSnapshot(path)
+
+            # Changes that can't be decoded are reported when they're read.
+            content = self.log['0.3.0'].added['content'].encode()
+            start = data.index(content)
+            path.write_bytes(data[:start] + b'\xff' + data[start + 1:])
+            log = Changelog.loadSnapshot(path)
+            with self.assertRaises(ChangelogFormatException):
+                log['0.3.0']
+            with self.assertRaises(ChangelogFormatException):
+                Changelog.loadSnapshot(path, lazy=False)
+
+    def testStreamingJSON(self):
+        log = Changelog(pathlib.Path(__file__).parent / 'testlog.md', lazy=True)
+        self.assertEqual(dict(log.iterDicts()), self.log.toDict())
+        # Iterating doesn't keep the changes of a lazy change log.
+        self.assertEqual(len(log._changes), 0)
+
+        buffer = io.StringIO()
+        log.dumpJSON(buffer)
+        self.assertEqual(buffer.getvalue(), json.dumps(self.log.toDict()))
+
+    def testRelease(self):
+        head = '# Changelog\n\n## [Unreleased]\n\n### Added\n- Feature\n\n'
+        tail = ('## [1.0.0] - 2024-02-01\n\n### Fixed\n- Bug\n\n'
+                '[Unreleased]: https://example.com/compare/v1.0.0...HEAD\n'
+                '[1.0.0]: https://example.com/releases/v1.0.0\n')
+        with tempfile.TemporaryDirectory() as tempDir:
+            path = pathlib.Path(tempDir) / 'CHANGELOG.md'
+            for lazy in (False, True):
+                path.write_text(head + tail)
+                log = Changelog(path, lazy=lazy)
+                log.release('1.1.0', '2024-03-01')
+                self.assertEqual(path.read_text(), '# Changelog\n\n## [Unreleased]\n\n## [1.1.0] - 2024-03-01\n\n'
+                                 '### Added\n- Feature\n\n## [1.0.0] - 2024-02-01\n\n### Fixed\n- Bug\n\n'
+                                 '[Unreleased]: https://example.com/compare/v1.1.0...HEAD\n'
+                                 '[1.1.0]: https://example.com/compare/v1.0.0...v1.1.0\n'
+                                 '[1.0.0]: https://example.com/releases/v1.0.0\n')
+                self.assertEqual([str(v) for v in log.versions], ['Unreleased', '1.1.0', '1.0.0'])
+                self.assertEqual(log['1.1.0'].added['content'], '- Feature')
+                self.assertEqual(log['Unreleased'].toDict()['added'], {})
+                self.assertEqual(log.getVersion('1.1.0')['link'], 'https://example.com/compare/v1.0.0...v1.1.0')
+                self.assertEqual(log._sections, Changelog(path)._sections)
+                self.assertEqual(log.toDict(), Changelog(path).toDict())
+
+                with self.assertRaises(ValueError):
+                    log.release('1.0.0')
+                with self.assertRaises(ValueError):
+                    log.release('Unreleased')
+                with self.assertRaises(ValueError):
+                    log.release('1.2.0', '03/01/2024')
+
+            # The line endings of the file are kept.
+            path.write_bytes((head + tail).replace('\n', '\r\n').encode())
+            Changelog(path).release('1.1.0', '2024-03-01')
+            self.assertNotIn(b'\n', path.read_bytes().replace(b'\r\n', b''))
+
+            # Only the edited places are written, the rest of the file keeps its own line endings and encoding.
+            mixed = head.replace('Feature', 'Café').replace('\n', '\r\n') + tail
+            released = mixed.replace('## [Unreleased]\r\n', '## [Unreleased]\r\n\r\n## [1.1.0] - 2024-03-01\r\n')
+            released = released.replace('v1.0.0...HEAD\n', 'v1.1.0...HEAD\r\n'
+                                        '[1.1.0]: https://example.com/compare/v1.0.0...v1.1.0\n')
+            for memoryMap in (False, True):
+                path.write_bytes(mixed.encode())
+                with Changelog(path, memoryMap=memoryMap) as log:
+                    log.release('1.1.0', '2024-03-01')
+                    self.assertEqual(path.read_bytes(), released.encode())
+                    self.assertEqual(log._sections, Changelog(path, memoryMap=memoryMap)._sections)
+
+            # The Unreleased heading can end the file.
+            for contents in ('# Changelog\n\n## [Unreleased]', '# Changelog\n\n## [Unreleased]\n'):
+                for memoryMap in (False, True):
+                    path.write_text(contents)
+                    with Changelog(path, memoryMap=memoryMap) as log:
+                        log.release('1.1.0', '2024-03-01')
+                        self.assertEqual(path.read_text(),
+                                         '# Changelog\n\n## [Unreleased]\n\n## [1.1.0] - 2024-03-01\n')
+                        with Changelog(path, memoryMap=memoryMap) as fresh:
+                            self.assertEqual(log._sections, fresh._sections)
+
+            path.write_text(tail)
+            with self.assertRaises(ChangelogFormatException):
+                Changelog(path).release('1.1.0')
+
+    def testAddEntry(self):
+        contents = ('# Changelog\n\n## [Unreleased]\n\n### Added\n\n- Feature\n\n### Fixed\n\n- Bug\n\n'
+                    '## [1.0.0] - 2024-02-01\n\n### Fixed\n\n- Old bug\n\n[1.0.0]: https://example.com/1.0.0\n')
+        with tempfile.TemporaryDirectory() as tempDir:
+            path = pathlib.Path(tempDir) / 'CHANGELOG.md'
+            path.write_text(contents)
+            log = Changelog(path, lazy=True)
+            log.addEntry('Added', 'Other feature')
+            log.addEntry('changed', 'Behavior\nspanning two lines')
+            log.addEntry('security', 'Hole', '1.0.0')
+            log.addEntry('added', 'First', '1.0.0')
+            self.assertEqual(path.read_text(), '# Changelog\n\n## [Unreleased]\n\n### Added\n\n- Feature\n'
+                             '- Other feature\n\n### Changed\n\n- Behavior\n  spanning two lines\n\n'
+                             '### Fixed\n\n- Bug\n\n'
+                             '## [1.0.0] - 2024-02-01\n\n### Added\n\n- First\n\n### Fixed\n\n- Old bug\n\n'
+                             '### Security\n\n- Hole\n\n[1.0.0]: https://example.com/1.0.0\n')
+            self.assertEqual(list(log['Unreleased'].entries('changed')), ['Behavior\n  spanning two lines'])
+            self.assertEqual(log._sections, Changelog(path)._sections)
+            self.assertEqual(log.toDict(), Changelog(path).toDict())
+
+            with self.assertRaises(ValueError):
+                log.addEntry('misc', 'Text')
+            with self.assertRaises(ValueError):
+                log.addEntry('added', ' \n')
+            with self.assertRaises(ValueError):
+                log.addEntry('added', 'Text', '2.0.0')
+
+        with self.assertRaises(TypeError):
+            with tempfile.TemporaryDirectory() as tempDir:
+                snapshot = pathlib.Path(tempDir) / 'changelog.snapshot'
+                self.log.dump(snapshot)
+                Changelog.loadSnapshot(snapshot, lazy=False).addEntry('added', 'Text')
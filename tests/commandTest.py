@@ -1,15 +1,17 @@
 import argparse
+import json
 import os
 import pathlib
 import subprocess
 import sys
+import tempfile
 import unittest
 import contextlib
 import io
 import changelog_handler
 
-from changelog_handler.__main__ import CheckUniqueTags, DEFAULT_TAG_ORDER, createParser, getChangelogPath, \
-    getTagOrder, printChanges
+from changelog_handler.__main__ import CheckUniqueTags, DEFAULT_TAG_ORDER, createParser, getCachePath, \
+    getChangelogPath, getSocketPath, getTagOrder, printChanges, main
 
 
 @contextlib.contextmanager
@@ -101,6 +103,38 @@ class CommandTest(unittest.TestCase):
         path = pathlib.Path('foo/bar/baz.md')
         self.assertEqual(getChangelogPath(args), path)
 
+    def testCachePath(self):
+        parser = createParser()
+
+        args = parser.parse_args(['--cache', 'foo.cache', '1.1.1'])
+        self.assertEqual(getCachePath(args), pathlib.Path('foo.cache'))
+        self.assertEqual(args.version, [changelog_handler.SemanticVersion('1.1.1')])
+
+        args = parser.parse_args(['--default-cache', '1.1.1'])
+        self.assertEqual(getCachePath(args), pathlib.Path(changelog_handler.DEFAULT_CACHE_PATH))
+        self.assertEqual(args.version, [changelog_handler.SemanticVersion('1.1.1')])
+
+        with assertRaisesQuietly(self):
+            parser.parse_args(['1.1.1', '--cache'])
+        with assertRaisesQuietly(self):
+            parser.parse_args(['1.1.1', '--default-cache', '--no-cache'])
+
+    def testSocketPath(self):
+        parser = createParser()
+
+        args = parser.parse_args(['--socket', 'foo.sock', '1.1.1'])
+        self.assertEqual(getSocketPath(args), pathlib.Path('foo.sock'))
+        self.assertEqual(args.version, [changelog_handler.SemanticVersion('1.1.1')])
+
+        args = parser.parse_args(['--default-socket', '1.1.1'])
+        self.assertEqual(getSocketPath(args), pathlib.Path(changelog_handler.DEFAULT_SOCKET_PATH))
+        self.assertEqual(args.version, [changelog_handler.SemanticVersion('1.1.1')])
+
+        with assertRaisesQuietly(self):
+            parser.parse_args(['1.1.1', '--socket'])
+        with assertRaisesQuietly(self):
+            parser.parse_args(['1.1.1', '--socket', 'foo.sock', '--default-socket'])
+
     def testTagOrder(self):
         parser = createParser()
 
@@ -155,6 +189,61 @@ class CommandTest(unittest.TestCase):
         os.remove(outputFile)
         outputFile.parent.rmdir()
 
+    def testMultipleVersions(self):
+        logPath = str(pathlib.Path(__file__).parent / 'testlog.md')
+        parser = createParser()
+
+        with prohibitExit():
+            args = parser.parse_args(['0.0.1', '0.0.2..0.0.4', '1.0.0..'])
+        self.assertEqual(args.version, [changelog_handler.SemanticVersion('0.0.1'),
+                                        (changelog_handler.SemanticVersion('0.0.2'),
+                                         changelog_handler.SemanticVersion('0.0.4')),
+                                        (changelog_handler.SemanticVersion('1.0.0'), None)])
+        with assertRaisesQuietly(self):
+            parser.parse_args(['1.x'])
+        with assertRaisesQuietly(self):
+            main(['--changelog-path', logPath])
+
+        buffer = io.StringIO()
+        with contextlib.redirect_stdout(buffer):
+            main(['0.0.5..0.0.6', '0.0.2', '--changelog-path', logPath, '--prepend', '# {version}\n',
+                  '--separator', '\n---\n'])
+        self.assertEqual(buffer.getvalue(), '# 0.0.6\n### Added\n\n- README section on "yanked" releases.\n---\n'
+                                            '# 0.0.5\n### Added\n\n- Markdown links to version tags on release '
+                                            'headings.\n- Unreleased section to gather unreleased changes and '
+                                            'encourage note\n  keeping prior to releases.\n---\n# 0.0.2\n### '
+                                            'Added\n\n- Explanation of the recommended reverse chronological '
+                                            'release ordering.')
+
+        log = changelog_handler.Changelog(logPath)
+        with tempfile.TemporaryDirectory() as tempDir:
+            main(['--all', '--add-link', '--changelog-path', logPath, '--output-path',
+                  os.path.join(tempDir, '{version}.md')])
+            self.assertEqual(len(os.listdir(tempDir)), len(log.versions))
+            with open(os.path.join(tempDir, '1.0.0.md'), 'r') as f:
+                self.assertTrue(f.read().endswith(f'[1.0.0]: {log.links[changelog_handler.SemanticVersion("1.0.0")]}'))
+
+    def testJSONFormat(self):
+        logPath = str(pathlib.Path(__file__).parent / 'testlog.md')
+        log = changelog_handler.Changelog(logPath)
+
+        for versions in (['--all'], ['0.3.0', '0.0.1..0.0.2'], ['1.1.1']):
+            buffer = io.StringIO()
+            with contextlib.redirect_stdout(buffer):
+                main(versions + ['--changelog-path', logPath, '--format', 'json'])
+            output = json.loads(buffer.getvalue())
+            if versions == ['--all']:
+                self.assertEqual(output, log.toDict())
+            else:
+                self.assertEqual(list(output), [v for v in ('0.3.0', '0.0.2', '0.0.1', '1.1.1') if v in output])
+                self.assertEqual(output, {v: log.getVersion(v) for v in output})
+
+        with tempfile.TemporaryDirectory() as tempDir:
+            main(['--all', '--changelog-path', logPath, '--format', 'json', '--output-path',
+                  os.path.join(tempDir, '{version}.json')])
+            with open(os.path.join(tempDir, '0.0.7.json'), 'r') as f:
+                self.assertEqual(json.load(f), log.getVersion('0.0.7'))
+
     def testCommandLine(self):
         # Version 0.0.7 will be used because it has single line outputs and reduces the
         # size of this file.
@@ -0,0 +1,53 @@
+import unittest
+
+from changelog_handler import VersionConstraint, InvalidConstraint, SemanticVersion, Unreleased
+
+
+class ConstraintTest(unittest.TestCase):
+    versions = ['0.0.3', '0.0.4', '0.2.3', '0.2.9', '0.3.0', '1.0.0', '1.3.9', '1.4.0-rc.1', '1.4.0', '1.4.7',
+                '1.9.9', '2.0.0-0', '2.0.0-rc.1', '2.0.0', '2.1.0', '2.1.5', '2.2.0-alpha', '2.2.0']
+
+    def testConstraints(self):
+        tests = {
+            '^1.4': ['1.4.0', '1.4.7', '1.9.9'],
+            '^0.2.3': ['0.2.3', '0.2.9'],
+            '^0.0.3': ['0.0.3'],
+            '~2.1.0': ['2.1.0', '2.1.5'],
+            '~2': ['2.0.0', '2.1.0', '2.1.5', '2.2.0-alpha', '2.2.0'],
+            '>=1.0.0,<2.0.0-0': ['1.0.0', '1.3.9', '1.4.0-rc.1', '1.4.0', '1.4.7', '1.9.9'],
+            '>= 1.4.0 < 2': ['1.4.0', '1.4.7', '1.9.9'],
+            '>2.1.0': ['2.1.5', '2.2.0-alpha', '2.2.0'],
+            '<=0.2.3': ['0.0.3', '0.0.4', '0.2.3'],
+            '=1.4.0-rc.1': ['1.4.0-rc.1'],
+            '1.4.x': ['1.4.0', '1.4.7'],
+            '1.0.0 - 1.4': ['1.0.0', '1.3.9', '1.4.0-rc.1', '1.4.0', '1.4.7'],
+            '<0.2 || ^2.1': ['0.0.3', '0.0.4', '2.1.0', '2.1.5', '2.2.0-alpha', '2.2.0'],
+            '>=2.0.0 <1.0.0': [],
+            '*': self.versions,
+        }
+
+        for specifier, answer in tests.items():
+            with self.subTest(specifier=specifier):
+                constraint = VersionConstraint(specifier)
+                self.assertEqual([str(v) for v in constraint.filter(self.versions)], answer)
+                self.assertEqual([v for v in self.versions if v in constraint], answer)
+
+    def testFilter(self):
+        constraint = VersionConstraint('^1.0.0')
+        versions = [SemanticVersion('1.2.0'), Unreleased, SemanticVersion('0.9.0'), SemanticVersion('1.0.0')]
+        self.assertEqual(constraint.filter(versions), [SemanticVersion('1.2.0'), SemanticVersion('1.0.0')])
+        self.assertEqual(VersionConstraint('*').filter(versions), [v for v in versions if v is not Unreleased])
+        self.assertFalse(constraint.matches(Unreleased))
+        self.assertEqual(constraint.filter([]), [])
+
+    def testInvalid(self):
+        for specifier in ('', 'abc', '>>1.0.0', '^1.2-rc', '1.0.0 ||'):
+            with self.subTest(specifier=specifier), self.assertRaises(InvalidConstraint):
+                VersionConstraint(specifier)
+
+        with self.assertRaises(TypeError):
+            VersionConstraint(1)
+
+
+if __name__ == '__main__':
+    unittest.main()
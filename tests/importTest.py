@@ -0,0 +1,84 @@
+import importlib
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import changelog_handler
+
+# Modules that are slow to import and are only needed by some features, so importing the package mustn't load them.
+DEFERRED = ['importlib.metadata', 'asyncio', 'concurrent.futures', 'multiprocessing', 'socket', 'socketserver',
+            'platform', 'json', 'datetime', 'hashlib', 'threading', 'changelog_handler.scanner',
+            'changelog_handler.server', 'changelog_handler.profiling', 'changelog_handler.search',
+            'changelog_handler.cache', 'changelog_handler.constraint', 'changelog_handler.table',
+            'changelog_handler._snapshot']
+# The command line only imports the modules of its subcommands and options when they're used.
+CLI_DEFERRED = ['importlib.metadata', 'asyncio', 'platform', 'concurrent.futures', 'multiprocessing', 'socket',
+                'socketserver', 'changelog_handler.scanner', 'changelog_handler.server', 'changelog_handler.search',
+                'changelog_handler.profiling']
+# The most time in microseconds importing the package and the command line may take, about twice what they take
+# on a typical machine so that a slow or busy one doesn't fail, but a newly eager import of a slow module does.
+BUDGET = {'changelog_handler': 15_000, 'changelog_handler.__main__': 25_000}
+
+
+def importedModules(statement: str) -> set[str]:
+    """Run a statement in a new interpreter, returning the names of every module imported once it has run."""
+
+    proc = subprocess.run([sys.executable, '-c', f'{statement}\nimport sys\nprint(*sys.modules, sep="\\n")'],
+                          text=True, stdout=subprocess.PIPE, check=True)
+    return set(proc.stdout.split())
+
+
+def importTime(module: str, runs: int = 5) -> int:
+    """Return the least cumulative time in microseconds -X importtime reports for importing a module in a new
+    interpreter. Bytecode is written to a temporary directory so compiling the modules isn't measured."""
+
+    with tempfile.TemporaryDirectory() as tempDir:
+        env = dict(os.environ, PYTHONPYCACHEPREFIX=tempDir)
+        env.pop('PYTHONDONTWRITEBYTECODE', None)
+        times = []
+        # The first run only compiles the modules.
+        for _ in range(runs + 1):
+            proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'], env=env, text=True,
+                                  stderr=subprocess.PIPE, check=True)
+            match = re.search(rf'^import time:\s*\d+ \|\s*(\d+) \| {re.escape(module)}$', proc.stderr, re.M)
+            times.append(int(match[1]))
+    return min(times[1:])
+
+
+class ImportTest(unittest.TestCase):
+
+    def assertNotImported(self, statement: str, deferred: list[str]):
+        modules = importedModules(statement)
+        for name in deferred:
+            self.assertNotIn(name, modules, f'{statement!r} imported {name}')
+
+    def testPackage(self):
+        self.assertNotImported('import changelog_handler', DEFERRED)
+
+    def testCommandLine(self):
+        self.assertNotImported('import changelog_handler.__main__', CLI_DEFERRED)
+
+    def testImportTime(self):
+        for module, budget in BUDGET.items():
+            with self.subTest(module=module):
+                self.assertLess(importTime(module), budget)
+
+    def testLazyVersion(self):
+        self.assertIn('importlib.metadata', importedModules('import changelog_handler; changelog_handler.__version__'))
+
+    def testLazyModules(self):
+        for module, names in changelog_handler._LAZY.items():
+            self.assertCountEqual(names, importlib.import_module(f'changelog_handler.{module}').__all__)
+            for name in names:
+                self.assertIn(name, changelog_handler.__all__)
+                self.assertIn(name, dir(changelog_handler))
+
+        modules = importedModules('from changelog_handler import scan')
+        self.assertIn('changelog_handler.scanner', modules)
+        self.assertNotIn('changelog_handler.server', modules)
+
+        with self.assertRaises(AttributeError):
+            changelog_handler.notAName
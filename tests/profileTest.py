@@ -0,0 +1,102 @@
+import contextlib
+import io
+import pathlib
+import threading
+import unittest
+
+from changelog_handler import Changelog, Changes, PHASES, Profile, SemanticVersion, extractChanges
+from changelog_handler.__main__ import main
+
+
+class ProfileTest(unittest.TestCase):
+    path = pathlib.Path(__file__).parent / 'testlog.md'
+
+    def testPhases(self):
+        with Profile() as profile:
+            log = Changelog(self.path)
+
+        phases = profile.phases
+        self.assertEqual(list(phases), list(PHASES))
+        self.assertEqual(phases['read'].calls, 1)
+        self.assertEqual(phases['read'].bytes, self.path.stat().st_size)
+        self.assertEqual(phases['scan'].calls, 1)
+        self.assertGreaterEqual(phases['version'].calls, len(log.versions))
+        self.assertEqual(phases['changes'].calls, len(log.versions))
+        self.assertTrue(all(stats.time >= 0 for stats in phases.values()))
+        self.assertEqual(profile.toDict()['read'], phases['read'].toDict())
+        self.assertEqual(len(profile.report().splitlines()), len(PHASES) + 1)
+
+        # Nothing is recorded once the profile is finished.
+        Changelog(self.path)
+        self.assertEqual(phases['read'].calls, 1)
+
+    def testNested(self):
+        calls = []
+        with Profile() as outer:
+            with Profile(callback=lambda *args: calls.append(args)) as inner:
+                SemanticVersion('1.2.3')
+            SemanticVersion('1.2.4')
+
+        self.assertEqual(inner.phases['version'].calls, 1)
+        self.assertEqual(outer.phases['version'].calls, 2)
+        self.assertEqual(calls[0][0], 'version')
+        self.assertEqual(calls[0][2], len('1.2.3'))
+
+    def testUnbound(self):
+        # The timed methods are only bound while a profile is active, in any thread.
+        def methods():
+            return (SemanticVersion.__dict__['__new__'], Changelog.__dict__['_read'],
+                    Changelog.__dict__['_parseChangelog'], Changes.__dict__['_parseTags'])
+
+        original = methods()
+        for method in original:
+            self.assertFalse(hasattr(getattr(method, '__func__', method), '__wrapped__'))
+
+        entered, done = threading.Event(), threading.Event()
+
+        def profile():
+            with Profile():
+                entered.set()
+                done.wait(5)
+
+        thread = threading.Thread(target=profile)
+        thread.start()
+        entered.wait(5)
+        with Profile():
+            self.assertTrue(all(a is not b for a, b in zip(methods(), original)))
+        self.assertTrue(all(a is not b for a, b in zip(methods(), original)))
+        done.set()
+        thread.join()
+
+        self.assertEqual(methods(), original)
+
+    def testThreads(self):
+        # A profile only records the loads of the thread that entered it.
+        with Profile() as profile:
+            thread = threading.Thread(target=Changelog, args=(self.path,))
+            thread.start()
+            thread.join()
+            extractChanges(self.path, '0.0.2')
+
+        self.assertEqual(profile.phases['read'].calls, 1)
+        self.assertEqual(profile.phases['scan'].calls, 1)
+        self.assertEqual(profile.phases['changes'].calls, 1)
+
+    def testCommandLine(self):
+        output, errors = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(errors):
+            main(['-p', str(self.path), '0.0.1..0.0.3', '--profile'])
+
+        report = errors.getvalue().splitlines()
+        self.assertEqual([line.split()[0] for line in report[1:]], list(PHASES))
+        self.assertEqual(report[1].split()[1], '1')
+
+        # A single version is streamed by extractChanges, which records its reading and scanning too.
+        errors = io.StringIO()
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(errors):
+            main(['-p', str(self.path), '0.0.2', '--profile'])
+
+        report = {line.split()[0]: line.split()[1:] for line in errors.getvalue().splitlines()[1:]}
+        for phase in ('read', 'scan', 'changes'):
+            self.assertEqual(report[phase][0], '1')
+        self.assertGreater(int(report['read'][2]), 0)
@@ -0,0 +1,69 @@
+import contextlib
+import io
+import json
+import pathlib
+import pickle
+import shutil
+import tempfile
+import unittest
+
+from changelog_handler import Changelog, ChangelogSummary, SemanticVersion, scan, summarize
+from changelog_handler.__main__ import main
+
+
+class ScanTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tempDir = tempfile.TemporaryDirectory()
+        cls.root = pathlib.Path(cls.tempDir.name)
+        thisDir = pathlib.Path(__file__).parent
+        for name in ('a', 'b', 'b/c'):
+            (cls.root / name).mkdir(parents=True)
+        shutil.copy(thisDir / 'testlog.md', cls.root / 'a' / 'CHANGELOG.md')
+        shutil.copy(thisDir / 'inlinelog.md', cls.root / 'b' / 'c' / 'CHANGELOG.md')
+        (cls.root / 'b' / 'CHANGELOG.md').write_text('No versions here.\n')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tempDir.cleanup()
+
+    def testSummarize(self):
+        path = self.root / 'a' / 'CHANGELOG.md'
+        summary = summarize(path)
+        log = Changelog(path)
+
+        self.assertEqual(summary.path, str(path))
+        self.assertEqual(summary.versions, [str(v) for v in log.versions])
+        self.assertEqual(summary.links, {str(v): url for v, url in log.links.items()})
+        self.assertEqual(summary.sections['0.0.7'], log._sections[SemanticVersion('0.0.7')])
+        self.assertEqual(summary.error, '')
+        self.assertEqual(pickle.loads(pickle.dumps(summary)), summary)
+
+        summary = summarize(self.root / 'b' / 'CHANGELOG.md')
+        self.assertEqual(summary.versions, [])
+        self.assertTrue(summary.error.startswith('ChangelogFormatException'))
+
+    def testScan(self):
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                summaries = {s.path: s for s in scan(self.root, workers=workers)}
+                self.assertEqual(set(summaries), {str(self.root / p / 'CHANGELOG.md') for p in ('a', 'b', 'b/c')})
+                self.assertTrue(all(isinstance(s, ChangelogSummary) for s in summaries.values()))
+                self.assertEqual(len(summaries[str(self.root / 'b' / 'c' / 'CHANGELOG.md')].versions), 15)
+
+        self.assertEqual([s.path for s in scan(self.root, pattern='a/*.md')], [str(self.root / 'a' / 'CHANGELOG.md')])
+
+    def testCommand(self):
+        buffer = io.StringIO()
+        with contextlib.redirect_stdout(buffer):
+            status = main(['scan', str(self.root), '--workers', '1'])
+
+        self.assertEqual(status, 1)
+        summaries = [json.loads(line) for line in buffer.getvalue().splitlines()]
+        self.assertEqual(len(summaries), 3)
+        self.assertEqual(sum(1 for s in summaries if s['error']), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import contextlib
+import io
+import json
+import pathlib
+import tempfile
+import unittest
+
+from changelog_handler import Changelog, SearchIndex, SemanticVersion, tokenize
+from changelog_handler.__main__ import main
+
+
+class SearchTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.path = pathlib.Path(__file__).parent / 'testlog.md'
+        cls.log = Changelog(cls.path)
+
+    def assertHits(self, query: str, expected: list[tuple[str, str, int]], **kwargs):
+        hits = self.log.search(query, **kwargs)
+        self.assertEqual([(str(h.version), h.tag, h.position) for h in hits], expected)
+        for hit in hits:
+            self.assertEqual(hit.entry, self.log[hit.version].entries(hit.tag)[hit.position])
+
+    def testTokenize(self):
+        self.assertEqual(tokenize('Improve Persian translation (#457).'), ['improve', 'persian', 'translation', '457'])
+
+    def testQueries(self):
+        self.assertHits('#457', [('1.1.1', 'fixed', 2)])
+        self.assertHits('FRENCH translation', [('1.1.1', 'added', 1), ('1.1.1', 'fixed', 0), ('1.1.1', 'fixed', 6),
+                                               ('1.0.0', 'added', 13), ('1.0.0', 'changed', 11)])
+        self.assertHits('french translation', [('1.1.1', 'fixed', 0), ('1.1.1', 'fixed', 6)], tags=['fixed'])
+        self.assertHits('tag:fixed french translation', [('1.1.1', 'fixed', 0), ('1.1.1', 'fixed', 6)])
+        self.assertHits('"japanese translation"', [('1.1.1', 'added', 4)])
+        self.assertHits('"translation japanese"', [])
+        self.assertHits('"yanked" releases', [('0.0.6', 'added', 0)])
+        self.assertHits('translation', [('1.1.1', 'added', 0)], limit=1)
+        self.assertHits('nonexistent', [])
+
+        hits = self.log.search('tag:removed')
+        self.assertTrue(hits)
+        self.assertTrue(all(hit.tag == 'removed' for hit in hits))
+        self.assertIsInstance(hits[0].version, SemanticVersion)
+
+        for query in ('', 'tag:unknown'):
+            with self.subTest(query=query), self.assertRaises(ValueError):
+                self.log.search(query)
+
+    def testPersistence(self):
+        index = self.log.searchIndex
+        self.assertIs(self.log.searchIndex, index)
+        with tempfile.TemporaryDirectory() as tempDir:
+            path = pathlib.Path(tempDir) / 'index.json'
+            index.save(path)
+            loaded = SearchIndex.load(path)
+
+        self.assertEqual(len(loaded), len(index))
+        for query in ('translation', '"french translation"', 'tag:security'):
+            self.assertEqual(loaded.search(query), index.search(query))
+        with self.assertRaises(ValueError):
+            SearchIndex.fromDict({'format': 0})
+
+    def testCommandLine(self):
+        with tempfile.TemporaryDirectory() as tempDir:
+            cachePath = pathlib.Path(tempDir) / 'cache'
+            # The second search loads the index from the cache.
+            for _ in range(2):
+                output = io.StringIO()
+                with contextlib.redirect_stdout(output):
+                    status = main(['search', 'french', 'translation', '-t', 'fixed', '-p', str(self.path), '--cache',
+                                   str(cachePath), '--format', 'json'])
+                self.assertEqual(status, 0)
+                lines = [json.loads(line) for line in output.getvalue().splitlines()]
+                self.assertEqual([(line['version'], line['tag'], line['position']) for line in lines],
+                                 [('1.1.1', 'fixed', 0), ('1.1.1', 'fixed', 6)])
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(main(['search', '#457', '-p', str(self.path)]), 0)
+            self.assertEqual(main(['search', 'nonexistent', '-p', str(self.path)]), 1)
+        self.assertEqual(output.getvalue(), '1.1.1\tfixed\tImprove Persian translation (#457).\n')
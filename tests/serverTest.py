@@ -0,0 +1,97 @@
+import contextlib
+import io
+import os
+import pathlib
+import shutil
+import socketserver
+import stat
+import tempfile
+import threading
+import unittest
+
+from changelog_handler import Changelog, ChangelogClient, ChangelogServer, ServerError
+from changelog_handler.__main__ import main
+
+
+@unittest.skipUnless(hasattr(socketserver, 'ThreadingUnixStreamServer'), 'Unix sockets are not supported')
+class ServerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+        root = pathlib.Path(self.tempDir.name)
+        self.path = root / 'CHANGELOG.md'
+        shutil.copy(pathlib.Path(__file__).parent / 'testlog.md', self.path)
+        self.socketPath = root / 'server.sock'
+
+        self.server = ChangelogServer(self.socketPath).listen()
+        self.thread = threading.Thread(target=self.server.serveForever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.thread.join()
+        self.tempDir.cleanup()
+
+    def testRequests(self):
+        log = Changelog(self.path)
+        with ChangelogClient(self.socketPath) as client:
+            self.assertEqual(client.request('list', self.path), [str(v) for v in log.versions])
+            self.assertEqual(client.request('get', self.path, version='0.3.0'), log.getVersion('0.3.0'))
+            self.assertEqual(client.request('links', self.path), {str(v): url for v, url in log.links.items()})
+            self.assertEqual(client.request('all', self.path), log.toDict())
+            self.assertEqual(list(client.request('all', self.path)), [str(v) for v in log.versions])
+            self.assertEqual(list(client.request('range', self.path, low='0.2.0', high='1.0.0')),
+                             ['1.0.0', '0.3.0', '0.2.0'])
+            self.assertEqual(list(client.request('range', self.path, low='0.2.0', high='1.0.0', inclusive=False)),
+                             ['0.3.0'])
+
+            with self.assertRaises(ServerError):
+                client.request('get', self.path, version='9.9.9')
+            with self.assertRaises(ServerError):
+                client.request('delete', self.path)
+            # The connection is still usable after an error.
+            self.assertIn('1.0.0', client.request('list', self.path))
+
+    def testInvalidation(self):
+        with ChangelogClient(self.socketPath) as client:
+            self.assertNotIn('9.0.0', client.request('list', self.path))
+
+            contents = self.path.read_text()
+            self.path.write_text(contents.replace('## [1.1.1]', '## [9.0.0] - 2030-01-01\n\n### Added\n- Everything\n\n'
+                                                  '## [1.1.1]', 1))
+            stat = os.stat(self.path)
+            os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+            self.assertIn('9.0.0', client.request('list', self.path))
+            self.assertEqual(client.request('get', self.path, version='9.0.0')['changes']['added']['content'],
+                             '- Everything')
+
+    def testCommandLine(self):
+        expected = io.StringIO()
+        with contextlib.redirect_stdout(expected):
+            main(['-p', str(self.path), '0.3.0', '0.0.1..0.0.3', '--add-link', '--prepend', '# {version}\n'])
+
+        for socketPath in (self.socketPath, self.socketPath.with_name('missing.sock')):
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                main(['-p', str(self.path), '0.3.0', '0.0.1..0.0.3', '--add-link', '--prepend', '# {version}\n',
+                      '--socket', str(socketPath)])
+            self.assertEqual(output.getvalue(), expected.getvalue())
+
+        expected = io.StringIO()
+        with contextlib.redirect_stdout(expected):
+            main(['-p', str(self.path), '--all'])
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            main(['-p', str(self.path), '--all', '--socket', str(self.socketPath)])
+        self.assertEqual(output.getvalue(), expected.getvalue())
+
+        # A version the server can't find falls back to the same error as parsing here.
+        with self.assertRaises(KeyError):
+            main(['-p', str(self.path), '9.9.9', '--socket', str(self.socketPath)])
+
+    def testAlreadyListening(self):
+        # Only the user running the server can connect.
+        self.assertEqual(stat.S_IMODE(os.stat(self.socketPath).st_mode), 0o600)
+        with self.assertRaises(OSError):
+            ChangelogServer(self.socketPath).listen()
@@ -0,0 +1,92 @@
+import unittest
+
+from changelog_handler import SemanticVersion, InvalidSemanticVersion, Unreleased, VersionTable
+
+
+class TableTest(unittest.TestCase):
+    strings = ['1.0.0', '1.0.0-alpha', '1.0.0-alpha.1', '0.9.0+build.7', '1.0.0-beta.11', '2.0.0', '1.0.0-alpha.beta',
+               '1.0.0+b', '1.0.0-beta.2', '1.0.0-rc.1', '0.9.0+build.1', '1.0.0-beta']
+
+    def testConstruction(self):
+        table = VersionTable([SemanticVersion('v1.0.0-alpha+001'), '2.0.0'])
+        table.append('3.1.4-rc.1')
+        table.extend([SemanticVersion('0.0.1')])
+        self.assertEqual(len(table), 4)
+        self.assertEqual(table.strings(), ['1.0.0-alpha+001', '2.0.0', '3.1.4-rc.1', '0.0.1'])
+        self.assertEqual(table[0], SemanticVersion('1.0.0-alpha'))
+        self.assertEqual(table[0].buildMetadata, '001')
+        self.assertEqual(table[-1], SemanticVersion('0.0.1'))
+        self.assertEqual(table[1:3].strings(), ['2.0.0', '3.1.4-rc.1'])
+        self.assertEqual(list(table), table.toList())
+        self.assertEqual(table.toList(), SemanticVersion.parseMany(table.strings()))
+        with self.assertRaises(IndexError):
+            table[4]
+
+        with self.assertRaises(InvalidSemanticVersion):
+            table.append('1.0')
+        with self.assertRaises(InvalidSemanticVersion):
+            table.append('1.0.0-01')
+        with self.assertRaises(ValueError):
+            table.append(Unreleased)
+        with self.assertRaises(TypeError):
+            table.append(1)
+        with self.assertRaises(OverflowError):
+            table.append(f'{2 ** 64}.0.0')
+        self.assertEqual(len(table), 4)
+
+        # The pre-release and build strings are only stored once.
+        table = VersionTable.fromStrings([f'{i}.0.0-rc.1+linux' for i in range(100)])
+        self.assertEqual(len(table._strings), 3)
+
+    def testFromStrings(self):
+        table = VersionTable.fromStrings(self.strings)
+        self.assertEqual(table.strings(), self.strings)
+
+        strings = ['1.0.0', 'Unreleased', 'bad', '1.0.0-01', '2.0.0\n3.0.0', 'v2.0.0']
+        with self.assertRaises(InvalidSemanticVersion):
+            VersionTable.fromStrings(strings)
+        self.assertEqual(VersionTable.fromStrings(strings, errors='skip').strings(), ['1.0.0', '2.0.0'])
+        table, invalid = VersionTable.fromStrings(strings, errors='collect')
+        self.assertEqual(table.strings(), ['1.0.0', '2.0.0'])
+        self.assertEqual(invalid, strings[1:5])
+        with self.assertRaises(ValueError):
+            VersionTable.fromStrings(strings, errors='ignore')
+
+    def testContains(self):
+        table = VersionTable.fromStrings(self.strings)
+        self.assertIn('1.0.0-rc.1', table)
+        self.assertIn(SemanticVersion('2.0.0'), table)
+        # Build metadata is ignored, the same as comparing SemanticVersion objects.
+        self.assertIn('0.9.0+other', table)
+        self.assertNotIn('1.0.0-rc.2', table)
+        self.assertNotIn('3.0.0', table)
+        self.assertNotIn('not a version', table)
+        self.assertNotIn(Unreleased, table)
+
+    def testFilter(self):
+        table = VersionTable.fromStrings(self.strings)
+        self.assertEqual(table.filter(major=0).strings(), ['0.9.0+build.7', '0.9.0+build.1'])
+        self.assertEqual(table.filter(major=1, preRelease=False).strings(), ['1.0.0', '1.0.0+b'])
+        self.assertEqual(len(table.filter(preRelease=True)), 7)
+        self.assertEqual(table.filter(preRelease='beta.2').strings(), ['1.0.0-beta.2'])
+        self.assertEqual(len(table.filter(preRelease='gamma')), 0)
+        self.assertEqual(len(table.filter(minor=9, patch=1)), 0)
+        self.assertEqual(table.filter().strings(), self.strings)
+
+    def testSort(self):
+        table = VersionTable.fromStrings(self.strings)
+        expected = sorted(SemanticVersion.parseMany(self.strings), key=SemanticVersion.sortKey)
+        table.sort()
+        self.assertEqual(table.strings(), [str(v) for v in expected])
+
+        # Equal versions keep their order in both directions, the same as sorted().
+        table = VersionTable.fromStrings(self.strings)
+        expected = sorted(SemanticVersion.parseMany(self.strings), key=SemanticVersion.sortKey, reverse=True)
+        table.sort(reverse=True)
+        self.assertEqual(table.strings(), [str(v) for v in expected])
+
+        # Strings added after sorting are ranked when sorting again.
+        table.extend(['1.0.0-alpha.0', '1.0.0-zeta'])
+        table.sort()
+        self.assertEqual(table.strings()[2:4], ['1.0.0-alpha', '1.0.0-alpha.0'])
+        self.assertEqual(table.strings()[-4], '1.0.0-zeta')
@@ -1,7 +1,10 @@
+import pickle
 import unittest
 from copy import deepcopy
+from unittest import mock
 
 from changelog_handler import SemanticVersion, InvalidSemanticVersion, Unreleased
+from changelog_handler.version import DEFAULT_CACHE_SIZE
 
 
 class VersionTest(unittest.TestCase):
@@ -98,6 +101,50 @@ class VersionTest(unittest.TestCase):
             with self.subTest(version=version):
                 self.assertEqual(version.toDict(), answer)
 
+    def testSortKey(self):
+        vStrings = ['1.0.0', '1.0.0-beta.11', '1.0.0-alpha', '1.0.0-beta.2', '1.0.0-alpha.beta', '1.0.0-1',
+                    '1.0.0-alpha.1', '1.0.0-rc.1', '0.9.9', '1.0.0-beta', 'Unreleased']
+        answer = ['0.9.9', '1.0.0-1', '1.0.0-alpha', '1.0.0-alpha.1', '1.0.0-alpha.beta', '1.0.0-beta',
+                  '1.0.0-beta.2', '1.0.0-beta.11', '1.0.0-rc.1', '1.0.0', 'Unreleased']
+
+        self.assertEqual([str(v) for v in sorted(vStrings, key=SemanticVersion.sortKey)], answer)
+        versions = [SemanticVersion(s) for s in vStrings]
+        self.assertEqual(sorted(versions, key=SemanticVersion.sortKey), sorted(versions))
+        self.assertEqual(SemanticVersion('1.0.0+abc').precedence, SemanticVersion('1.0.0').precedence)
+        self.assertGreater(SemanticVersion('1.0.0-alpha.1'), SemanticVersion('1.0.0-alpha'))
+        self.assertLessEqual(SemanticVersion('1.0.0+abc'), SemanticVersion('1.0.0'))
+
+        with self.assertRaises(TypeError):
+            SemanticVersion.sortKey(1)
+
+    def testParseMany(self):
+        tests = ['1.2.3', 'v1.0.0-alpha.1+001', 'Unreleased', '1.2.3', '1.0', '1.0.0-01', 'a\n1.0.0', '']
+        versions = [SemanticVersion('1.2.3'), SemanticVersion('1.0.0-alpha.1+001'), Unreleased,
+                    SemanticVersion('1.2.3')]
+
+        self.assertEqual(SemanticVersion.parseMany(tests[:4]), versions)
+        self.assertEqual(SemanticVersion.parseMany(tests, errors='skip'), versions)
+        self.assertEqual(SemanticVersion.parseMany(tests, errors='collect'), (versions, tests[4:]))
+        self.assertEqual(SemanticVersion.parseMany([]), [])
+
+        with self.assertRaises(InvalidSemanticVersion):
+            SemanticVersion.parseMany(tests)
+        with self.assertRaises(TypeError):
+            SemanticVersion.parseMany(['1.0.0', 1])
+        with self.assertRaises(ValueError):
+            SemanticVersion.parseMany(tests, errors='ignore')
+
+    def testFindAll(self):
+        text = ('v1.2.3\n1.2.4-rc.1 fixes #12 from 1.2.3.\nrequires foo-2.0.0+build.5, not 3.0, 1.2.3.4 or '
+                'ver4.0.0\n1.0.0-01')
+        answers = [SemanticVersion('1.2.3'), SemanticVersion('1.2.4-rc.1'), SemanticVersion('1.2.3'),
+                   SemanticVersion('2.0.0+build.5')]
+
+        self.assertEqual(SemanticVersion.findAll(text, errors='skip'), answers)
+        self.assertEqual(SemanticVersion.findAll(text, errors='collect'), (answers, ['1.0.0-01']))
+        with self.assertRaises(InvalidSemanticVersion):
+            SemanticVersion.findAll(text)
+
     def testEquality(self):
         versions = [
             SemanticVersion('v1.0.0'),
@@ -112,6 +159,55 @@ class VersionTest(unittest.TestCase):
             with self.subTest(version=v):
                 self.assertEqual(v, c)
 
+    def testHash(self):
+        versions = {SemanticVersion('1.0.0'), SemanticVersion('1.0.0-alpha'), Unreleased}
+
+        self.assertIn(SemanticVersion('1.0.0+build.5'), versions)
+        self.assertIn(SemanticVersion('v1.0.0-alpha+001'), versions)
+        self.assertIn(SemanticVersion('unreleased'), versions)
+        self.assertNotIn(SemanticVersion('1.0.0-beta'), versions)
+        self.assertEqual(hash(SemanticVersion('1.2.3+abc')), hash(SemanticVersion('1.2.3')))
+
+    def testInterning(self):
+        SemanticVersion.setCacheSize(2)
+        try:
+            first = SemanticVersion('1.2.3-rc.1+build')
+            self.assertIs(SemanticVersion('1.2.3-rc.1+build'), first)
+            self.assertEqual(SemanticVersion.cacheInfo()[:2], (1, 1))
+
+            # Evicted strings are parsed again, to an equal instance.
+            SemanticVersion('2.0.0')
+            SemanticVersion('3.0.0')
+            self.assertIsNot(SemanticVersion('1.2.3-rc.1+build'), first)
+            self.assertEqual(SemanticVersion('1.2.3-rc.1+build'), first)
+            self.assertEqual(SemanticVersion.cacheInfo().currsize, 2)
+
+            with self.assertRaises(InvalidSemanticVersion):
+                SemanticVersion('1.0')
+        finally:
+            SemanticVersion.setCacheSize(DEFAULT_CACHE_SIZE)
+
+        version = SemanticVersion('1.0.0-alpha')
+        with self.assertRaises(AttributeError):
+            version._major = 2
+        self.assertIs(pickle.loads(pickle.dumps(version)), version)
+        self.assertIs(pickle.loads(pickle.dumps(Unreleased)), Unreleased)
+
+        # Batch parsing shares the same instances.
+        self.assertIs(SemanticVersion.parseMany(['1.0.0-alpha'])[0], version)
+        self.assertIs(SemanticVersion.findAll('released 1.0.0-alpha today')[0], version)
+        self.assertIs(SemanticVersion.parseMany(['4.5.6'])[0], SemanticVersion('4.5.6'))
+
+        # Batch parsing builds the versions it misses from its own matches and adds them to the cache.
+        SemanticVersion.clearCache()
+        with mock.patch.object(SemanticVersion, '_parse', side_effect=AssertionError):
+            parsed = SemanticVersion.parseMany(['7.0.0', '7.0.1', '7.0.0'])
+            found = SemanticVersion.findAll('7.0.1 and 7.0.2')
+        self.assertEqual(SemanticVersion.cacheInfo(), (1, 3, DEFAULT_CACHE_SIZE, 3))
+        self.assertIs(found[0], parsed[1])
+        self.assertIs(SemanticVersion('7.0.2'), found[1])
+        self.assertEqual(SemanticVersion.cacheInfo()[:2], (2, 3))
+
     def testUnreleased(self):
         self.assertLess(SemanticVersion('1.0.0'), Unreleased)
         self.assertNotEqual(SemanticVersion('1.2.3'), Unreleased)